@@ -0,0 +1,202 @@
+"""Input/output drivers the games read from and write to"""
+import io
+import random
+import sys
+from contextlib import contextmanager
+
+from terminal import NullRenderer, TerminalRenderer
+
+class ConsoleDriver:
+    """Reads from the keyboard and writes to the terminal.
+
+    Everything a game shows goes through write(), so each driver owns its
+    output and sessions on different threads never mix their text.
+    """
+    def __init__(self, output=None):
+        self._output = output
+        self._frame = None
+
+    @property
+    def output(self):
+        """Stream the session writes to, the terminal unless one was given"""
+        return self._output or sys.stdout
+
+    def read(self, prompt=''):
+        """Show `prompt` and return one line of input"""
+        return input(prompt)
+
+    def write(self, *values, sep=' ', end='\n'):
+        """Write like print(), into the current frame if one is open"""
+        stream = self.output if self._frame is None else self._frame
+        print(*values, sep=sep, end=end, file=stream)
+
+    @contextmanager
+    def frame(self, renderer):
+        """Collect everything written inside the block into one frame"""
+        self._frame = io.StringIO()
+        try:
+            yield self
+            text = self._frame.getvalue()
+        finally:
+            self._frame = None
+        renderer.render(text)
+
+    def renderer(self):
+        """New renderer for one game played through this driver"""
+        return TerminalRenderer(self._output)
+
+    @contextmanager
+    def session(self):
+        """Run one game session; the console needs no setup"""
+        yield self
+
+class NullStream:
+    """Output stream that throws everything away"""
+    def write(self, text):
+        """Discard `text`"""
+        return len(text)
+
+    def flush(self):
+        """Nothing to flush"""
+
+class ScriptedDriver(ConsoleDriver):
+    """Feeds a fixed sequence of inputs and collects or discards output.
+
+    Written text goes to `output`, which discards it unless a stream is
+    given, and frames are never drawn, so scripted games run headless.
+    """
+    def __init__(self, inputs, output=None):
+        super().__init__(output or NullStream())
+        self._inputs = iter(inputs)
+
+    def read(self, prompt=''):
+        """Write `prompt` and return the next scripted input"""
+        self.write(prompt, end='')
+        try:
+            line = next(self._inputs)
+        except StopIteration:
+            raise EOFError('the script has no more input') from None
+        self.write(line)
+        return line
+
+    def renderer(self):
+        """Scripted sessions are headless, so frames are never drawn"""
+        return NullRenderer()
+
+class RecordingDriver(ConsoleDriver):
+    """Plays through another driver and records the session for replay.
+
+    The state of the `random` module is saved when the session starts, so
+    replaying the inputs deals the same cards and robot moves. Games with
+    an unseeded generator of their own seed it from `random` inside the
+    session; games given an explicit seed must be given it again.
+    """
+    def __init__(self, driver=None):
+        self.driver = driver or ConsoleDriver()
+        self.inputs = []
+        self.random_state = None
+
+    def read(self, prompt=''):
+        """Read from the wrapped driver and remember the answer"""
+        line = self.driver.read(prompt)
+        self.inputs.append(line)
+        return line
+
+    @property
+    def output(self):
+        """Stream of the wrapped driver"""
+        return self.driver.output
+
+    def write(self, *values, sep=' ', end='\n'):
+        """Write through the wrapped driver"""
+        self.driver.write(*values, sep=sep, end=end)
+
+    def frame(self, renderer):
+        """Frame of the wrapped driver"""
+        return self.driver.frame(renderer)
+
+    def renderer(self):
+        """Renderer of the wrapped driver"""
+        return self.driver.renderer()
+
+    @contextmanager
+    def session(self):
+        """Record the random state, then run the wrapped driver's session"""
+        self.random_state = random.getstate()
+        with self.driver.session():
+            yield self
+
+    def save(self, path):
+        """Write the recorded session to a JSON file"""
+        import json
+        with open(path, 'w', encoding='utf-8') as record_file:
+            json.dump({'random_state': self.random_state,
+                       'inputs': self.inputs}, record_file)
+
+class ReplayDriver(ScriptedDriver):
+    """Replays a session saved by RecordingDriver"""
+    def __init__(self, inputs, random_state=None, output=None):
+        super().__init__(inputs, output)
+        self.random_state = random_state
+
+    @classmethod
+    def load(cls, path, output=None):
+        """Driver for the session recorded in `path`"""
+        import json
+        with open(path, encoding='utf-8') as record_file:
+            record = json.load(record_file)
+
+        state = record['random_state']
+        if state is not None:
+            version, internal, gauss = state
+            state = (version, tuple(internal), gauss)
+        return cls(record['inputs'], state, output)
+
+    @contextmanager
+    def session(self):
+        """Restore the recorded random state, then replay headless"""
+        if self.random_state is not None:
+            random.setstate(self.random_state)
+        with super().session():
+            yield self
+
+class AsyncDriver(ScriptedDriver):
+    """Plays a scripted game ahead, then paces its output on an event loop.
+
+    Scripted input never waits for anyone, and an 'async' pacer only adds
+    up the pauses, so the game runs straight through. At every read the
+    driver notes the text written since the last one and the pauses owed
+    before it. run() then writes the text back out and awaits each pause
+    on the loop, so no thread sits waiting and one loop can pace as many
+    sessions as it has memory for.
+    """
+    def __init__(self, inputs, pacer, output=None):
+        if pacer.mode != 'async':
+            raise ValueError(f'AsyncDriver needs an async pacer, '
+                             f'not {pacer.mode!r}')
+        super().__init__(inputs, io.StringIO())
+        self.pacer = pacer
+        self.destination = output or NullStream()
+        self._steps = []
+
+    def read(self, prompt=''):
+        """Note the text and pauses so far, then read the next input"""
+        self._end_step()
+        return super().read(prompt)
+
+    def _end_step(self):
+        self._steps.append((self._output.getvalue(), self.pacer.take_owed()))
+        self._output.seek(0)
+        self._output.truncate()
+
+    async def run(self, play):
+        """Call `play`, then write its output paced on the running loop"""
+        import asyncio
+        try:
+            play()
+        finally:
+            self._end_step()
+        steps, self._steps = self._steps, []
+        for text, pause in steps:
+            self.destination.write(text)
+            await asyncio.sleep(pause)
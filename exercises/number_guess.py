@@ -1,49 +1,85 @@
 import random
-import math
+
+from drivers import ConsoleDriver
 
 class GuessingGame:
 
-    def __init__(self, start, stop):
+    def __init__(self, start, stop, driver=None):
+        self.check_bounds(start, stop)
+        self.driver = driver or ConsoleDriver()
         self.start = start
         self.stop = stop
-        self.num_range = range(start, stop + 1)
-        self.correct_num = random.choice(self.num_range)
-        self.guesses_remaining = int(math.log2(stop - start + 1)) + 1
+        # Only the bounds are stored, so any size of integer range works
+        # within the digit limit checked by check_bounds.
+        # low and high narrow to the numbers still possible after each
+        # "too high" or "too low".
+        self.low = start
+        self.high = stop
+        self.correct_num = random.randint(start, stop)
+        self.guesses_remaining = self.guess_budget(start, stop)
         self.is_correct_guess = False
 
+    @staticmethod
+    def check_bounds(start, stop):
+        # The bounds and guesses are shown and read as decimal text, so
+        # they are limited to sys.get_int_max_str_digits() digits (4300 by
+        # default) unless that limit is raised for the whole process.
+        try:
+            str(start), str(stop)
+        except ValueError:
+            raise ValueError('The bounds have too many digits to show; '
+                             'see sys.set_int_max_str_digits') from None
+
+    @staticmethod
+    def guess_budget(start, stop):
+        # Exact floor(log2(size)) + 1, even for sizes a float can't hold.
+        return (stop - start + 1).bit_length()
+
     def play(self):
-        self.__init__(self.start, self.stop)
+        with self.driver.session():
+            self.__init__(self.start, self.stop, self.driver)
 
-        while True:
+            while True:
 
-            if self.guesses_remaining == 0:
-                self._game_lost()
-                break
+                if self.guesses_remaining == 0:
+                    self._game_lost()
+                    break
 
-            self._display_remaining_guesses()
+                self._display_remaining_guesses()
 
-            guess = self._user_guess()
+                guess = self._user_guess()
 
-            if self._determine_if_correct(guess):
-                print("That's the number!")
-                self._game_won()
-                break
+                if self._determine_if_correct(guess):
+                    self.driver.write("That's the number!")
+                    self._game_won()
+                    break
 
-            self._lost_round(guess)
+                self._lost_round(guess)
             
 
     def _user_guess(self):
 
         while True:
-            guess = input(f'Enter a number between {self.num_range[0]} and {self.num_range[-1]}: ')
+            guess = self.driver.read(f'Enter a number between {self.start} '
+                                     f'and {self.stop}: ')
+
+            try:
+                number = int(guess) if guess.isdigit() else None
+            except ValueError:
+                # Longer than the int conversion limit, so out of range.
+                number = None
 
-            if guess.isdigit() and int(guess) in self.num_range:
-                return int(guess)
+            if number is not None and self.start <= number <= self.stop:
+                return number
             else:
-                print('Invalid Guess.')
+                self.driver.write('Invalid Guess.')
 
     def _display_remaining_guesses(self):
-        print(f'\nYou have {self.guesses_remaining} guesses remaining.')
+        self.driver.write(f'\nYou have {self.guesses_remaining} '
+                          'guesses remaining.')
+        if (self.low, self.high) != (self.start, self.stop):
+            self.driver.write(f'The number is between {self.low} '
+                              f'and {self.high}.')
 
     def _determine_if_correct(self, guess):
         if guess == self.correct_num:
@@ -53,19 +89,29 @@ class GuessingGame:
 
     def _display_comparison(self, guess):
         if guess > self.correct_num:
-            print('Your guess is too high')
+            self.driver.write('Your guess is too high')
         else:
-            print('Your guess is too low')
+            self.driver.write('Your guess is too low')
+
+    def _narrow_range(self, guess):
+        if guess > self.correct_num:
+            self.high = min(self.high, guess - 1)
+        else:
+            self.low = max(self.low, guess + 1)
 
     def _lost_round(self, guess):
         self.guesses_remaining -= 1
+        self._narrow_range(guess)
         self._display_comparison(guess)
 
     def _game_lost(self):
-        print('\nYou have no more guesses. You lost!')
+        self.driver.write('\nYou have no more guesses. You lost!')
 
     def _game_won(self):
-        print('\nYou won!')
+        self.driver.write('\nYou won!')
+
+def main():
+    GuessingGame(501, 1500).play()
 
-game = GuessingGame(501, 1500)
-game.play()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
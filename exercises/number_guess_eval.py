@@ -0,0 +1,112 @@
+import argparse
+import time
+
+import numpy as np
+
+from exercises.number_guess import GuessingGame
+
+# A strategy maps arrays of the current (low, high) bounds to one guess per
+# interval. Every correct_num in an interval has seen the same feedback, so
+# the evaluator only ever tracks the distinct intervals, never the targets.
+
+def binary_search(low, high, rng):
+    return (low + high) // 2
+
+def biased_split(fraction):
+    def strategy(low, high, rng):
+        return low + ((high - low) * fraction).astype(np.int64)
+
+    return strategy
+
+def random_split(low, high, rng):
+    return rng.integers(low, high + 1)
+
+STRATEGIES = {
+    'binary': binary_search,
+    'third': biased_split(1 / 3),
+    'random': random_split,
+}
+
+class EvaluationResult:
+    def __init__(self, targets, budget):
+        self.targets = targets
+        self.budget = budget
+        # wins_on[n] is how many targets are found with the n-th guess.
+        self.wins_on = np.zeros(budget + 1, dtype=np.int64)
+
+    @property
+    def wins(self):
+        return int(self.wins_on.sum())
+
+    @property
+    def losses(self):
+        return self.targets - self.wins
+
+    @property
+    def win_rate(self):
+        return self.wins / self.targets
+
+    @property
+    def mean_guesses(self):
+        # Guesses used per game, a loss using the whole budget.
+        used = int((self.wins_on * np.arange(self.budget + 1)).sum())
+        return (used + self.losses * self.budget) / self.targets
+
+    def __str__(self):
+        rows = [f'guess {number:>3}: {int(count):>12}'
+                for number, count in enumerate(self.wins_on) if count]
+        rows.append(f'lost     : {self.losses:>12}')
+        rows.append(f'win rate {self.win_rate:.6f}  '
+                    f'mean guesses {self.mean_guesses:.4f}')
+        return '\n'.join(rows)
+
+def evaluate(start, stop, strategy=binary_search, budget=None, seed=None):
+    # Plays every correct_num from start to stop at once. The result is
+    # exact for deterministic strategies; a randomized one draws one guess
+    # per interval, which keeps every target's odds unchanged.
+    rng = np.random.default_rng(seed)
+    budget = budget or GuessingGame.guess_budget(start, stop)
+    result = EvaluationResult(stop - start + 1, budget)
+
+    low = np.array([start], dtype=np.int64)
+    high = np.array([stop], dtype=np.int64)
+    for number in range(1, budget + 1):
+        if not len(low):
+            break
+
+        guess = np.asarray(strategy(low, high, rng), dtype=np.int64)
+        result.wins_on[number] = np.count_nonzero((low <= guess) &
+                                                  (guess <= high))
+
+        # "Too high" keeps the targets below the guess, "too low" the ones
+        # above it. Guesses outside an interval leave it whole.
+        below_high = np.minimum(guess - 1, high)
+        above_low = np.maximum(guess + 1, low)
+        low = np.concatenate((low, above_low))
+        high = np.concatenate((below_high, high))
+        keep = low <= high
+        low = low[keep]
+        high = high[keep]
+
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Score a guessing strategy against every target.')
+    parser.add_argument('start', type=int)
+    parser.add_argument('stop', type=int)
+    parser.add_argument('--strategy', choices=STRATEGIES, default='binary')
+    parser.add_argument('--budget', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    began = time.perf_counter()
+    result = evaluate(args.start, args.stop, STRATEGIES[args.strategy],
+                      args.budget, args.seed)
+    elapsed = time.perf_counter() - began
+
+    print(result)
+    print(f'\n{result.targets:,} targets in {elapsed:.2f}s')
+
+if __name__ == '__main__':
+    main()
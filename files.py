@@ -0,0 +1,21 @@
+"""Atomic writes for the tables the games generate and cache on disk"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+@contextmanager
+def atomic_write(path, mode='wb', encoding=None):
+    """Write `path` through a private temp file moved into place at the end.
+
+    Processes writing the same file at once never write to or rename each
+    other's temp file, and readers see either the old file or the new one.
+    """
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path),
+                                         suffix='.tmp')
+    try:
+        with os.fdopen(handle, mode, encoding=encoding) as temp_file:
+            yield temp_file
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
@@ -0,0 +1,19 @@
+"""Launcher for the games, each imported only when it is played"""
+import importlib
+
+# Game name -> module with a main() that starts an interactive session.
+GAMES = {
+    'ttt': 'lesson_5.oo_ttt',
+    'twentyone': 'lesson_5.twentyone',
+    'student21': 'lesson_5.student_21',
+    'rps': 'lesson_2.rps',
+    'guess': 'exercises.number_guess',
+}
+
+def load(name):
+    """Import the module for game `name`"""
+    return importlib.import_module(GAMES[name])
+
+def play(name):
+    """Start an interactive session of game `name`"""
+    load(name).main()
@@ -0,0 +1,15 @@
+"""python -m games <name>: start one of the games"""
+import argparse
+
+from games import GAMES, play
+
+def main():
+    """Parse the game name and play it"""
+    parser = argparse.ArgumentParser(prog='python -m games',
+                                     description='Play one of the games.')
+    parser.add_argument('game', choices=GAMES)
+    args = parser.parse_args()
+    play(args.game)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Check that every game module imports cold within a time budget"""
+import argparse
+import subprocess
+import sys
+
+from games import GAMES
+
+BUDGET_MS = 30
+RUNS = 5
+
+# Timed in a fresh interpreter so nothing is cached from earlier imports.
+TIMER = ('import time; start = time.perf_counter(); import {module}; '
+         'print((time.perf_counter() - start) * 1000)')
+
+def import_time(module, runs=RUNS):
+    """Best cold import time of `module` in milliseconds"""
+    times = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c',
+                                 TIMER.format(module=module)],
+                                capture_output=True, text=True, check=True,
+                                stdin=subprocess.DEVNULL)
+        times.append(float(result.stdout))
+    return min(times)
+
+def main():
+    """Report import times and exit non-zero if any is over budget"""
+    parser = argparse.ArgumentParser(
+        description='Check the cold import time of every game module.')
+    parser.add_argument('--budget', type=float, default=BUDGET_MS,
+                        help='milliseconds allowed per module')
+    parser.add_argument('--runs', type=int, default=RUNS)
+    args = parser.parse_args()
+
+    over = []
+    for name, module in GAMES.items():
+        elapsed = import_time(module, args.runs)
+        status = 'ok' if elapsed <= args.budget else 'OVER BUDGET'
+        print(f'{name:<10} {module:<24} {elapsed:7.2f} ms  {status}')
+        if elapsed > args.budget:
+            over.append(name)
+
+    if over:
+        sys.exit(f'{", ".join(over)} over the {args.budget:g} ms budget')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Pace many scripted sessions on one asyncio event loop"""
+import argparse
+import asyncio
+import random
+import time
+
+from drivers import AsyncDriver
+from lesson_2.rps import RPSGame
+from pacing import Pacer
+
+# Pick the random robot and cycle through the moves; once the game is won
+# the next moves also decline the move history and another game.
+SCRIPT = ['2'] + ['rock', 'paper', 'scissors', 'lizard', 'spock'] * 40
+SEED = 21
+
+async def session(scale):
+    """Play one scripted Rock Paper Scissors game, paced on the loop"""
+    pacer = Pacer('async', scale)
+    driver = AsyncDriver(SCRIPT, pacer)
+    # The game runs to the end before run() first awaits, so seeding here
+    # gives every session the same robot moves and the same pauses.
+    random.seed(SEED)
+    await driver.run(RPSGame(driver, pacer).play)
+
+async def pace(sessions, scale):
+    """Run `sessions` games at once on the running loop"""
+    await asyncio.gather(*(session(scale) for _ in range(sessions)))
+
+def timed(sessions, scale):
+    """Seconds taken to pace `sessions` games together"""
+    start = time.perf_counter()
+    asyncio.run(pace(sessions, scale))
+    return time.perf_counter() - start
+
+def main():
+    """Time the sessions together and compare with playing them in turn"""
+    parser = argparse.ArgumentParser(
+        description='Pace many scripted games on one event loop.')
+    parser.add_argument('sessions', type=int, nargs='?', default=8)
+    parser.add_argument('--scale', type=float, default=0.05,
+                        help='fraction of each real pause to wait')
+    args = parser.parse_args()
+
+    single = timed(1, args.scale)
+    together = timed(args.sessions, args.scale)
+    print(f'{args.sessions} sessions in {together:.2f} s, one session in '
+          f'{single:.2f} s, so {args.sessions * single:.2f} s '
+          f'if played one after another')
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,11 @@
 import random
-import os
-import time
+import struct
+from array import array
+from itertools import repeat
+from operator import add, mul
+
+from drivers import ConsoleDriver
+from pacing import Pacer
 
 class Score:
     WINNING_SCORE = 5
@@ -21,142 +26,266 @@ class Score:
     def increment_computer(self):
         self._computer += 1
 
+class MoveHistory:
+    CAPACITY = 1024
+
+    # Only the newest `capacity` move IDs are kept, one byte each, but
+    # indexes and len() count every move ever played.
+    def __init__(self, capacity=CAPACITY):
+        self._capacity = capacity
+        self._ids = array('B', bytes(capacity))
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        return Move.CHOICES[self.id_at(index)]
+
+    def append(self, move):
+        self._ids[self._count % self._capacity] = Move.IDS[move]
+        self._count += 1
+
+    def id_at(self, index):
+        if index < 0:
+            index += self._count
+        oldest = max(0, self._count - self._capacity)
+        if not oldest <= index < self._count:
+            raise IndexError('move is not in the history')
+        return self._ids[index % self._capacity]
+
+class RoundHistory:
+    CAPACITY = 4096
+    MAGIC = b'RPSH'
+    HEADER = struct.Struct('<4sII')
+    # Human move ID, computer move ID and Move outcome, one byte each.
+    RECORD_SIZE = 3
+
+    # With keep_evicted, rounds pushed out of the buffer are spilled to a
+    # temporary file, so export() still writes every round played.
+    def __init__(self, capacity=CAPACITY, keep_evicted=False):
+        self._capacity = capacity
+        self._records = array('B', bytes(capacity * self.RECORD_SIZE))
+        self._count = 0
+        self._keep_evicted = keep_evicted
+        self._evicted = None
+
+    def __len__(self):
+        return self._count
+
+    def record(self, human_id, computer_id):
+        outcome = Move.OUTCOMES[Move.round_index(human_id, computer_id)]
+        start = (self._count % self._capacity) * self.RECORD_SIZE
+        if self._keep_evicted and self._count >= self._capacity:
+            self._spill(start)
+        records = self._records
+        records[start] = human_id
+        records[start + 1] = computer_id
+        records[start + 2] = outcome
+        self._count += 1
+
+    def _spill(self, start):
+        if self._evicted is None:
+            import tempfile
+            self._evicted = tempfile.TemporaryFile()
+        self._evicted.write(self._records[start:start + self.RECORD_SIZE])
+
+    def first_kept(self):
+        return max(0, self._count - self._capacity)
+
+    def rounds(self):
+        # Yields (round number, human ID, computer ID, outcome), oldest
+        # kept round first.
+        for number in range(self.first_kept(), self._count):
+            start = (number % self._capacity) * self.RECORD_SIZE
+            yield (number + 1, *self._records[start:start + self.RECORD_SIZE])
+
+    def export(self, path):
+        # Without keep_evicted only the rounds still in the buffer are
+        # written; the header records how many rounds were played in all.
+        evicted = self.first_kept() if self._evicted is not None else 0
+        kept = self._count - self.first_kept() + evicted
+        with open(path, 'wb') as history_file:
+            history_file.write(self.HEADER.pack(self.MAGIC, self._count,
+                                                kept))
+            if self._evicted is not None:
+                import shutil
+                self._evicted.seek(0)
+                shutil.copyfileobj(self._evicted, history_file)
+            for _, *record in self.rounds():
+                history_file.write(bytes(record))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as history_file:
+            magic, count, kept = cls.HEADER.unpack(
+                history_file.read(cls.HEADER.size))
+            if magic != cls.MAGIC:
+                raise ValueError(f'{path} is not a round history file')
+            records = history_file.read(kept * cls.RECORD_SIZE)
+
+        history = cls(max(kept, 1))
+        history._count = count - kept
+        for start in range(0, len(records), cls.RECORD_SIZE):
+            history.record(records[start], records[start + 1])
+        return history
+
 class RPSGame:
-    def __init__(self):
-        self._human = Human()
+    ROBOT_INTRO_WAIT = 4
+    ROUND_RESULT_WAIT = 2
+
+    def __init__(self, driver=None, pacer=None, renderer=None,
+                 move_capacity=MoveHistory.CAPACITY,
+                 round_capacity=RoundHistory.CAPACITY,
+                 keep_evicted_rounds=False):
+        self.driver = driver or ConsoleDriver()
+        self.renderer = renderer or self.driver.renderer()
+        self.pacer = pacer or Pacer.from_environment()
+        self.move_capacity = move_capacity
+        self.round_capacity = round_capacity
+        self.keep_evicted_rounds = keep_evicted_rounds
+        self._human = Human(self.driver, move_capacity)
         self._computer = None
         self._robot_name = None
         self._score = Score()
-        self._robots = (R2D2(), HAL(), Daneel(self._human))
-        self._moves = (Rock(), Paper(), Scissors(), Spock(), Lizard())
-        self._round_history = []
+        self._robots = (R2D2(), HAL(), Daneel(self._human),
+                        Ava(self._human))
+        self._round_texts = None
+        self._round_history = RoundHistory(round_capacity,
+                                           keep_evicted_rounds)
 
     def _choose_robot(self):
         self._display_robots()
-        choice = input()
+        choice = self.driver.read()
         while choice not in [robot.OPTION for robot in self._robots]:
-            os.system('clear')
+            self.renderer.clear()
             self._display_robots()
-            choice = input('Please enter one of the valid choices: ')
+            choice = self.driver.read('Please enter one of the valid '
+                                      'choices: ')
 
         for robot in self._robots:
             if choice == robot.OPTION:
                 self._computer = robot
                 self._robot_name = robot.__class__.__name__
-                os.system('clear')
-                print(f'You are playing against: {self._robot_name}')
-                print(f'- {robot.info}')
-                time.sleep(4)
-                os.system('clear')
+                self._round_texts = Move.round_texts(self._robot_name)
+                self.renderer.clear()
+                self.driver.write('You are playing against: '
+                                  f'{self._robot_name}')
+                self.driver.write(f'- {robot.info}')
+                self.pacer.pause(self.ROBOT_INTRO_WAIT)
+                self.renderer.clear()
 
     def _display_robots(self):
         for robot in self._robots:
-            print(f'Enter "{robot.OPTION}" to play against '
-                  f'{robot.__class__.__name__}')
+            self.driver.write(f'Enter "{robot.OPTION}" to play against '
+                              f'{robot.__class__.__name__}')
 
     def _display_welcome_message(self):
-        print('Welcome to Rock Paper Scissors!\n')
+        self.driver.write('Welcome to Rock Paper Scissors!\n')
 
     def _display_goodbye_message(self):
-        os.system('clear')
-        print('\nThanks for playing Rock Paper Scissors. Goodbye!')
-
-    def _human_won_round(self):
+        self.renderer.clear()
+        self.driver.write('\nThanks for playing Rock Paper Scissors. Goodbye!')
 
-        human_move = self._human.move
-        computer_move = self._computer.move
+    def _round_index(self):
+        return Move.round_index(self._human.move_id, self._computer.move_id)
 
-        for choice in self._moves:
-            if human_move == choice and computer_move in choice.wins_against:
-                return True
-        return False
+    def _human_won_round(self):
+        return Move.OUTCOMES[self._round_index()] == Move.HUMAN_WINS
 
     def _display_scoreboard(self):
-        print(f'\nTotal player wins: {self._score._player}\n'
-              f'Total {self._robot_name} wins: {self._score._computer}\n')
+        self.driver.write(f'\nTotal player wins: {self._score._player}\n'
+                          f'Total {self._robot_name} wins: '
+                          f'{self._score._computer}\n')
 
     def _display_round_winner(self):
         human_move = self._human.move
         computer_move = self._computer.move
 
-        os.system('clear')
+        round_index = self._round_index()
+        outcome = Move.OUTCOMES[round_index]
+        round_result, round_message = self._round_texts[round_index]
 
-        print(f'\nYou chose: {human_move}\n'
-              f'{self._robot_name} chose: {computer_move}\n')
-
-        if self._human_won_round():
+        if outcome == Move.HUMAN_WINS:
             self._score.increment_player()
-            round_result = f'(You) {human_move.title()} beat {computer_move}'
-            print(round_result)
-            print('You win the round!')
-        elif self._human.move == self._computer.move:
-            round_result = 'It\'s a tie.'
-            print(round_result)
-        else:
+        elif outcome == Move.COMPUTER_WINS:
             self._score.increment_computer()
-            round_result = (f'({self._robot_name[0]}) '
-                            f'{computer_move.title()} beat {human_move}')
-            print(round_result)
-            print(f'{self._robot_name} wins the round!')
 
-        self._round_history.append(round_result)
-        self._display_scoreboard()
-        time.sleep(2)
+        with self.driver.frame(self.renderer):
+            self.driver.write(f'\nYou chose: {human_move}\n'
+                              f'{self._robot_name} chose: {computer_move}\n')
+            self.driver.write(round_result)
+            if round_message:
+                self.driver.write(round_message)
+
+            self._display_scoreboard()
+
+        self._round_history.record(self._human.move_id,
+                                   self._computer.move_id)
+        self.pacer.pause(self.ROUND_RESULT_WAIT)
 
     def _play_again(self):
-        play_again = input('\nEnter "y" if you would like to play again.'
-                           ' Press "Enter" if not. ')
-        os.system('clear')
+        play_again = self.driver.read('\nEnter "y" if you would like to '
+                                      'play again. Press "Enter" if not. ')
+        self.renderer.clear()
         return play_again.lower() == 'y'
 
     def _game_was_won(self):
         return self._score.player_won_game() or self._score.computer_won_game()
 
     def _display_game_winner(self):
-        os.system('clear')
+        self.renderer.clear()
         self._display_scoreboard()
 
         if self._score.player_won_game():
-            print('You won the game!')
+            self.driver.write('You won the game!')
         elif self._score.computer_won_game():
-            print(f'{self._robot_name} won the game!')
+            self.driver.write(f'{self._robot_name} won the game!')
         else:
-            print("It's a tie!")
+            self.driver.write("It's a tie!")
 
     def _display_move_history(self):
-        print('\nWould you like to see the move history?')
-        choice = input('Enter "y" to see. Press "Enter" to skip.')
+        self.driver.write('\nWould you like to see the move history?')
+        choice = self.driver.read('Enter "y" to see. Press "Enter" to skip.')
         if choice in ['y', 'Y']:
-            os.system('clear')
-            counter = 1
-            for round in self._round_history:
-                print(f'Round {counter}: {round}')
-                counter += 1
+            self.renderer.clear()
+            for number, human_id, computer_id, _ in (
+                    self._round_history.rounds()):
+                round_result, _ = self._round_texts[
+                    Move.round_index(human_id, computer_id)]
+                self.driver.write(f'Round {number}: {round_result}')
 
     def play(self):
-        self._display_welcome_message()
-        while True:
-            self.__init__()
-            self._choose_robot()
+        with self.driver.session():
+            self._display_welcome_message()
             while True:
-                self._human.choose()
-                self._computer.choose()
-                self._display_round_winner()
-                if self._game_was_won():
-                    self._display_game_winner()
+                self.__init__(self.driver, self.pacer, self.renderer,
+                              self.move_capacity, self.round_capacity,
+                              self.keep_evicted_rounds)
+                self._choose_robot()
+                while True:
+                    self._human.choose()
+                    self._computer.choose()
+                    self._display_round_winner()
+                    if self._game_was_won():
+                        self._display_game_winner()
+                        break
+
+                self._display_move_history()
+                if not self._play_again():
                     break
 
-            self._display_move_history()
-            if not self._play_again():
-                break
-
-        self._display_goodbye_message()
+            self._display_goodbye_message()
 
 class Player:
 
-    def __init__(self):
+    def __init__(self, history_capacity=MoveHistory.CAPACITY):
         self.move = None
-        self.move_history = []
+        self.move_history = MoveHistory(history_capacity)
+
+    @property
+    def move_id(self):
+        return Move.IDS[self.move]
 
 class Computer(Player):
 
@@ -204,20 +333,104 @@ class Daneel(Computer):
         else:
             self.move = self._human.move_history[-2]
 
-class Human(Player):
-    def __init__(self):
+class Ava(Computer):
+    OPTION = '4'
+    MAX_ORDER = 3
+    MIN_OBSERVATIONS = 2
+    DECAY_EVERY = 60
+    # Halving every n moves keeps each 16-bit counter below 2 * n.
+    MAX_DECAY_EVERY = 1 << 15
+
+    def __init__(self, human, max_order=MAX_ORDER,
+                 min_observations=MIN_OBSERVATIONS, decay_every=DECAY_EVERY):
+        if not 1 <= decay_every <= Ava.MAX_DECAY_EVERY:
+            raise ValueError(f'decay_every must be between 1 and '
+                             f'{Ava.MAX_DECAY_EVERY}')
+
         super().__init__()
+        self._human = human
+        self._max_order = max_order
+        self._min_observations = min_observations
+        self._decay_every = decay_every
+
+        # For each order k, _counts[k] holds how often each move followed
+        # each context of k moves, and _totals[k] the context sizes. They
+        # never grow, so learning and predicting cost the same every round.
+        moves = len(Move.CHOICES)
+        self._sizes = [moves ** order for order in range(max_order + 1)]
+        self._counts = [array('H', bytes(2 * size * moves))
+                        for size in self._sizes]
+        self._totals = [array('H', bytes(2 * size)) for size in self._sizes]
+        self._contexts = [0] * (max_order + 1)
+        self._learned = 0
+
+    @property
+    def info(self):
+        return 'Learns your patterns...'
+
+    def choose(self):
+        # The human's newest move is this round's, so learn everything
+        # before it and predict from there.
+        history = self._human.move_history
+        while self._learned < len(history) - 1:
+            self._learn(history.id_at(self._learned))
+
+        prediction = self._predict()
+        if prediction is None:
+            super().choose()
+        else:
+            self.move = random.choice(Move.BEATEN_BY[prediction])
+
+    def _learn(self, move_id):
+        moves = len(Move.CHOICES)
+        for order in range(min(self._learned, self._max_order) + 1):
+            context = self._contexts[order]
+            self._counts[order][context * moves + move_id] += 1
+            self._totals[order][context] += 1
+
+        self._learned += 1
+        for order in range(1, self._max_order + 1):
+            self._contexts[order] = ((self._contexts[order] * moves + move_id)
+                                     % self._sizes[order])
+
+        if self._learned % self._decay_every == 0:
+            self._decay()
+
+    def _decay(self):
+        for counts, totals in zip(self._counts, self._totals):
+            for index, count in enumerate(counts):
+                counts[index] = count >> 1
+            for index, total in enumerate(totals):
+                totals[index] = total >> 1
+
+    def _predict(self):
+        moves = len(Move.CHOICES)
+        for order in range(min(self._learned, self._max_order), -1, -1):
+            context = self._contexts[order]
+            if self._totals[order][context] < self._min_observations:
+                continue
+
+            start = context * moves
+            followers = self._counts[order][start:start + moves]
+            return followers.index(max(followers))
+
+        return None
+
+class Human(Player):
+    def __init__(self, driver=None, history_capacity=MoveHistory.CAPACITY):
+        super().__init__(history_capacity)
+        self.driver = driver or ConsoleDriver()
 
     def choose(self):
         while True:
-            choice = input(f'Choose {', '.join(Move.CHOICES)}:\n')
+            choice = self.driver.read(f'Choose {', '.join(Move.CHOICES)}:\n')
 
             if choice.isalpha():
                 choice = choice.lower()
                 if choice in Move.CHOICES:
                     break
 
-            print(f'Sorry, {choice} is not valid.')
+            self.driver.write(f'Sorry, {choice} is not valid.')
 
         self.move = choice
         self.move_history.append(self.move)
@@ -225,10 +438,69 @@ class Human(Player):
 class Move:
 
     CHOICES = ('rock', 'paper', 'scissors', 'lizard', 'spock')
+    IDS = {choice: move_id for move_id, choice in enumerate(CHOICES)}
+
+    TIE = 0
+    HUMAN_WINS = 1
+    COMPUTER_WINS = 2
+
+    # Flat CHOICES x CHOICES table of round outcomes, indexed by
+    # round_index(human_id, computer_id). Filled in below the subclasses.
+    OUTCOMES = ()
+    # The moves that beat each move ID.
+    BEATEN_BY = ()
 
     def __init__(self, wins_against):
         self.wins_against = wins_against
 
+    @staticmethod
+    def round_index(human_id, computer_id):
+        return human_id * len(Move.CHOICES) + computer_id
+
+    @staticmethod
+    def outcome_table(moves):
+        outcomes = []
+        for human_move in Move.CHOICES:
+            beats = next(move.wins_against for move in moves
+                         if move == human_move)
+            for computer_move in Move.CHOICES:
+                if computer_move in beats:
+                    outcomes.append(Move.HUMAN_WINS)
+                elif computer_move == human_move:
+                    outcomes.append(Move.TIE)
+                else:
+                    outcomes.append(Move.COMPUTER_WINS)
+
+        return bytes(outcomes)
+
+    @staticmethod
+    def round_texts(robot_name):
+        texts = []
+        for human_move in Move.CHOICES:
+            for computer_move in Move.CHOICES:
+                outcome = Move.OUTCOMES[Move.round_index(
+                    Move.IDS[human_move], Move.IDS[computer_move])]
+                if outcome == Move.HUMAN_WINS:
+                    texts.append((f'(You) {human_move.title()} '
+                                  f'beat {computer_move}',
+                                  'You win the round!'))
+                elif outcome == Move.TIE:
+                    texts.append(('It\'s a tie.', None))
+                else:
+                    texts.append((f'({robot_name[0]}) '
+                                  f'{computer_move.title()} beat {human_move}',
+                                  f'{robot_name} wins the round!'))
+
+        return tuple(texts)
+
+    @staticmethod
+    def resolve_rounds(human_ids, computer_ids):
+        # Resolves a whole batch of rounds with C-level iteration only:
+        # each pair of move IDs becomes a flat index into OUTCOMES.
+        indexes = map(add, map(mul, human_ids, repeat(len(Move.CHOICES))),
+                      computer_ids)
+        return bytes(map(Move.OUTCOMES.__getitem__, indexes))
+
     def __eq__(self, other):
         return other == self.__class__.__name__.lower()
 
@@ -252,4 +524,16 @@ class Spock(Move):
     def __init__(self):
         super().__init__(['scissors', 'rock'])
 
-RPSGame().play()
\ No newline at end of file
+Move.OUTCOMES = Move.outcome_table((Rock(), Paper(), Scissors(),
+                                    Lizard(), Spock()))
+Move.BEATEN_BY = tuple(
+    tuple(move for move in Move.CHOICES
+          if Move.OUTCOMES[Move.round_index(Move.IDS[move], move_id)] ==
+          Move.HUMAN_WINS)
+    for move_id in range(len(Move.CHOICES)))
+
+def main():
+    RPSGame().play()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+import argparse
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+from lesson_2.rps import HAL, R2D2, Ava, Daneel, Move, Player, Score
+
+GAMES_PER_CHUNK = 5_000
+# Some pairs can tie forever (Daneel copies R2D2's rock), so a game that
+# runs this long is scored as a draw.
+MAX_ROUNDS = 200
+Z_95 = 1.96
+
+# Robots that watch their opponent are given it when they are built.
+ROBOTS = {
+    'R2D2': lambda opponent: R2D2(),
+    'HAL': lambda opponent: HAL(),
+    'Daneel': Daneel,
+    'Ava': Ava,
+}
+
+class PairResult:
+    def __init__(self, first, second):
+        self.first = first
+        self.second = second
+        self.first_wins = 0
+        self.second_wins = 0
+        self.draws = 0
+        self.rounds = 0
+
+    @property
+    def games(self):
+        return self.first_wins + self.second_wins + self.draws
+
+    def add(self, other):
+        self.first_wins += other.first_wins
+        self.second_wins += other.second_wins
+        self.draws += other.draws
+        self.rounds += other.rounds
+
+class PendingMoveView:
+    # In a real game the human's move for the round is already in its
+    # history when the robot chooses. The robot in the first seat chooses
+    # before its opponent, so it watches the opponent's history through
+    # this view, which counts the pending move without revealing it.
+    def __init__(self, player):
+        self.move_history = self
+        self._history = player.move_history
+
+    def __len__(self):
+        return len(self._history) + 1
+
+    def __getitem__(self, index):
+        return Move.CHOICES[self.id_at(index)]
+
+    def id_at(self, index):
+        if index < 0:
+            index += len(self)
+        if index == len(self._history):
+            raise IndexError("this round's move has not been made yet")
+        return self._history.id_at(index)
+
+def build_pair(first_name, second_name):
+    # Each robot's own move history doubles as what its opponent watches,
+    # so both seats see exactly what a robot sees against a human.
+    first_view = Player()
+    second_view = Player()
+    first = ROBOTS[first_name](PendingMoveView(second_view))
+    second = ROBOTS[second_name](first_view)
+    first.move_history = first_view.move_history
+    second.move_history = second_view.move_history
+    return first, second
+
+def play_game(first, second):
+    # Robots choose in turn and record their move straight away, as
+    # Human.choose does.
+    score = Score()
+    rounds = 0
+    while not (score.player_won_game() or score.computer_won_game()):
+        if rounds == MAX_ROUNDS:
+            return None, rounds
+
+        first.choose()
+        first.move_history.append(first.move)
+        second.choose()
+        second.move_history.append(second.move)
+        rounds += 1
+
+        outcome = Move.OUTCOMES[Move.round_index(first.move_id,
+                                                 second.move_id)]
+        if outcome == Move.HUMAN_WINS:
+            score.increment_player()
+        elif outcome == Move.COMPUTER_WINS:
+            score.increment_computer()
+
+    return (Move.HUMAN_WINS if score.player_won_game()
+            else Move.COMPUTER_WINS), rounds
+
+def play_chunk(first_name, second_name, games, seed):
+    random.seed(seed)
+    result = PairResult(first_name, second_name)
+
+    for _ in range(games):
+        winner, rounds = play_game(*build_pair(first_name, second_name))
+
+        result.rounds += rounds
+        if winner is None:
+            result.draws += 1
+        elif winner == Move.HUMAN_WINS:
+            result.first_wins += 1
+        else:
+            result.second_wins += 1
+
+    return result
+
+def wilson_interval(wins, games, z=Z_95):
+    if not games:
+        return 0.0, 1.0
+
+    rate = wins / games
+    denominator = 1 + z * z / games
+    centre = rate + z * z / (2 * games)
+    margin = z * math.sqrt(rate * (1 - rate) / games +
+                           z * z / (4 * games * games))
+    return ((centre - margin) / denominator,
+            (centre + margin) / denominator)
+
+def run_tournament(robots, games, seed=0, workers=None):
+    pairs = list(combinations(robots, 2))
+    tasks = []
+    for pair_index, (first, second) in enumerate(pairs):
+        for chunk_index, start in enumerate(range(0, games,
+                                                  GAMES_PER_CHUNK)):
+            chunk_seed = (seed * 1_000_003 + pair_index) * 1_000_003
+            tasks.append((first, second,
+                          min(GAMES_PER_CHUNK, games - start),
+                          chunk_seed + chunk_index))
+
+    results = {pair: PairResult(*pair) for pair in pairs}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for chunk in pool.map(play_chunk, *zip(*tasks)):
+            results[(chunk.first, chunk.second)].add(chunk)
+    elapsed = time.perf_counter() - start
+
+    return results, elapsed
+
+def win_rate_matrix(robots, results):
+    matrix = {robot: {} for robot in robots}
+    for (first, second), result in results.items():
+        matrix[first][second] = (result.first_wins, result.games)
+        matrix[second][first] = (result.second_wins, result.games)
+    return matrix
+
+def display_results(robots, results, elapsed):
+    matrix = win_rate_matrix(robots, results)
+    width = max(len(robot) for robot in robots) + 2
+
+    print('Win rate of row robot against column robot '
+          '(95% Wilson interval)\n')
+    print(' ' * width + ''.join(f'{robot:>{width + 14}}'
+                                for robot in robots))
+    for robot in robots:
+        cells = []
+        for opponent in robots:
+            if opponent == robot:
+                cells.append(f'{"-":>{width + 14}}')
+                continue
+            wins, games = matrix[robot][opponent]
+            low, high = wilson_interval(wins, games)
+            cells.append(f'{wins / games:>{width}.3f} '
+                         f'[{low:.3f},{high:.3f}]')
+        print(f'{robot:<{width}}' + ''.join(cells))
+
+    rounds = sum(result.rounds for result in results.values())
+    games = sum(result.games for result in results.values())
+    draws = sum(result.draws for result in results.values())
+    print(f'\n{games} games ({draws} drawn after {MAX_ROUNDS} rounds), '
+          f'{rounds} rounds in {elapsed:.2f}s '
+          f'({rounds / elapsed:,.0f} rounds/s)')
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Round-robin tournament between the RPS robots.')
+    parser.add_argument('games', type=int,
+                        help='games per pair of robots')
+    parser.add_argument('--robots', nargs='+', choices=ROBOTS,
+                        default=list(ROBOTS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    results, elapsed = run_tournament(args.robots, args.games, args.seed,
+                                      args.workers)
+    display_results(args.robots, results, elapsed)
+
+if __name__ == '__main__':
+    main()
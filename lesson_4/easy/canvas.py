@@ -6,9 +6,10 @@ class Television:
     def model(self):
         return 'Omni Fire'
 
-tv = Television()
-print(tv.__class__.manufacturer())
-print(tv.model())
+if __name__ == '__main__':
+    tv = Television()
+    print(tv.__class__.manufacturer())
+    print(tv.model())
 
-print(Television.manufacturer())
-print(Television.model())
\ No newline at end of file
+    print(Television.manufacturer())
+    print(Television.model())
@@ -46,19 +46,19 @@ class Motorboat(Catamaran):
         super().__init__(1, 1, kilometers_per_liter, liters_of_fuel_capacity)
 
 
-auto = Auto()
-motorcycle = Motorcycle()
-catamaran = Catamaran(2, 2, 1.5, 600)
+if __name__ == '__main__':
+    auto = Auto()
+    motorcycle = Motorcycle()
+    catamaran = Catamaran(2, 2, 1.5, 600)
 
-print(auto.fuel_efficiency)             # 50
-print(auto.fuel_capacity)               # 25.0
-print(auto.range())                     # 1250.0
+    print(auto.fuel_efficiency)             # 50
+    print(auto.fuel_capacity)               # 25.0
+    print(auto.range())                     # 1250.0
 
-print(motorcycle.fuel_efficiency)       # 80
-print(motorcycle.fuel_capacity)         # 8.0
-print(motorcycle.range())               # 640.0
-
-print(catamaran.fuel_efficiency)        # 1.5
-print(catamaran.fuel_capacity)          # 600
-print(catamaran.range())                # 900.0
+    print(motorcycle.fuel_efficiency)       # 80
+    print(motorcycle.fuel_capacity)         # 8.0
+    print(motorcycle.range())               # 640.0
 
+    print(catamaran.fuel_efficiency)        # 1.5
+    print(catamaran.fuel_capacity)          # 600
+    print(catamaran.range())                # 900.0
@@ -14,8 +14,9 @@ class InvoiceEntry:
 
         self._quantity = num
 
-entry = InvoiceEntry('Marbles', 5000)
-print(entry.quantity)         # 5000
+if __name__ == '__main__':
+    entry = InvoiceEntry('Marbles', 5000)
+    print(entry.quantity)         # 5000
 
-entry.quantity = 10_000
-print(entry.quantity)         # 10_000
\ No newline at end of file
+    entry.quantity = 10_000
+    print(entry.quantity)         # 10_000
@@ -7,14 +7,15 @@ class KrispyKreme:
         return (f'{self.filling or 'Plain'}'
                 f'{(f' with {self.glazing}') if self.glazing else ''}')
 
-donut1 = KrispyKreme(None, None)
-donut2 = KrispyKreme('Vanilla', None)
-donut3 = KrispyKreme(None, 'sugar')
-donut4 = KrispyKreme(None, 'chocolate sprinkles')
-donut5 = KrispyKreme('Custard', 'icing')
+if __name__ == '__main__':
+    donut1 = KrispyKreme(None, None)
+    donut2 = KrispyKreme('Vanilla', None)
+    donut3 = KrispyKreme(None, 'sugar')
+    donut4 = KrispyKreme(None, 'chocolate sprinkles')
+    donut5 = KrispyKreme('Custard', 'icing')
 
-print(donut1)       # Plain
-print(donut2)       # Vanilla
-print(donut3)       # Plain with sugar
-print(donut4)       # Plain with chocolate sprinkles
-print(donut5)       # Custard with icing
\ No newline at end of file
+    print(donut1)       # Plain
+    print(donut2)       # Vanilla
+    print(donut3)       # Plain with sugar
+    print(donut4)       # Plain with chocolate sprinkles
+    print(donut5)       # Custard with icing
@@ -7,5 +7,6 @@ class Light:
         return (f'I have a brightness level of {self.brightness} '
                 f'and a color of {self.color}')
 
-my_light = Light(50, 'Red')
-print(my_light.status())
\ No newline at end of file
+if __name__ == '__main__':
+    my_light = Light(50, 'Red')
+    print(my_light.status())
@@ -0,0 +1,38 @@
+import random
+import time
+
+from lesson_5.oo_ttt import Board, Square
+
+SIZES = (3, 7, 15, 31, 63, 127)
+MOVES_PER_SIZE = 20_000
+
+def time_per_move(size, win_length, moves=MOVES_PER_SIZE, seed=0):
+    rng = random.Random(seed)
+    keys = list(range(1, size * size + 1))
+    markers = (Square.HUMAN_MARKER, Square.COMPUTER_MARKER)
+
+    elapsed = 0.0
+    played = 0
+    while played < moves:
+        board = Board(size, win_length)
+        rng.shuffle(keys)
+        start = time.perf_counter()
+        for turn, key in enumerate(keys):
+            marker = markers[turn % 2]
+            board.mark_square_at(key, marker)
+            played += 1
+            if board.has_winning_row(marker) or played == moves:
+                break
+        elapsed += time.perf_counter() - start
+
+    return elapsed / played
+
+def main():
+    print(f'{"size":>6} {"win":>4} {"usec/move":>10}')
+    for size in SIZES:
+        win_length = min(size, 5)
+        usec = time_per_move(size, win_length) * 1e6
+        print(f'{size:>6} {win_length:>4} {usec:>10.2f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+""" tracemalloc check that student_21 rounds do not grow memory"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from drivers import ScriptedDriver
+from lesson_5.student_21 import Card, Dealer, Player, TwentyOneGame
+
+class StandOnPlayer(Player):
+    """Hits below the dealer's stay score, like the dealer"""
+    def decide(self, dealer_upcard):
+        """Hit or stay without asking"""
+        return 'h' if self.hand_total < Dealer.DEALER_MUST_STAY_SCORE else 's'
+
+def play_rounds(game, rounds):
+    """Play `rounds` headless rounds through the real game loop"""
+    with game.driver.session():
+        for _ in range(rounds):
+            game.play_one_round()
+
+def main():
+    """Report traced memory after each block of rounds"""
+    parser = argparse.ArgumentParser(
+        description='Track memory use across many student_21 rounds.')
+    parser.add_argument('--blocks', type=int, default=10)
+    parser.add_argument('--rounds-per-block', type=int, default=100_000)
+    args = parser.parse_args()
+
+    game = TwentyOneGame(StandOnPlayer(), ScriptedDriver(()))
+    play_rounds(game, 1_000)
+
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    print(f"{'rounds':>10} {'current KiB':>12} {'peak KiB':>10} "
+          f"{'growth KiB':>11} {'rounds/s':>10}")
+
+    for block in range(1, args.blocks + 1):
+        start = time.perf_counter()
+        play_rounds(game, args.rounds_per_block)
+        elapsed = time.perf_counter() - start
+
+        current, peak = tracemalloc.get_traced_memory()
+        growth = sum(stat.size_diff for stat in
+                     tracemalloc.take_snapshot().compare_to(baseline,
+                                                            'filename'))
+        print(f"{block * args.rounds_per_block:>10} {current / 1024:>12.1f} "
+              f"{peak / 1024:>10.1f} {growth / 1024:>11.1f} "
+              f"{args.rounds_per_block / elapsed:>10,.0f}")
+
+    tracemalloc.stop()
+    # Every live Card, not just the interned ones, so a copy made
+    # anywhere would show up.
+    live = sum(isinstance(obj, Card) for obj in gc.get_objects())
+    print(f"\nLive Card instances: {live} "
+          f"({len(Card._interned)} interned)")
+
+if __name__ == '__main__':
+    main()
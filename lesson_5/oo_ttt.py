@@ -1,8 +1,13 @@
 import random
 import os
+import math
+import time
+from array import array
 
-class DisplayMixin:
+from drivers import ConsoleDriver
+from files import atomic_write
 
+class DisplayMixin:
     @staticmethod
     def join_or(elements, sep=', ', last_word='or'):
         elements = [str(element) for element in elements]
@@ -13,9 +18,8 @@ class DisplayMixin:
         else:
             return ""
         
-    @staticmethod
-    def clear_screen():
-        os.system('clear')
+    def clear_screen(self):
+        self.renderer.clear()
 
 class Square:
     INITIAL_MARKER = ' '
@@ -40,46 +44,153 @@ class Square:
         return self.marker
 
 class Board:
-    def __init__(self):
-        self.squares = {key: Square() for key in range(1, 10)}
+    CLASSIC_SIZE = 3
+
+    # The tables below describe the classic 3x3 board and are used by the
+    # exhaustive searches, which work on raw masks rather than on a Board.
+    POSSIBLE_WINNING_ROWS = (
+        (1, 2, 3),
+        (4, 5, 6),
+        (7, 8, 9),
+        (1, 4, 7),
+        (2, 5, 8),
+        (3, 6, 9),
+        (1, 5, 9),
+        (3, 5, 7),
+    )
+
+    SQUARE_BITS = {key: 1 << (key - 1) for key in range(1, 10)}
+    FULL_MASK = (1 << 9) - 1
+    WINNING_MASKS = tuple(sum(1 << (key - 1) for key in row)
+                          for row in POSSIBLE_WINNING_ROWS)
+
+    # (row, column) steps for the horizontal, vertical and two diagonal
+    # lines that pass through a square.
+    LINE_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+    def __init__(self, size=CLASSIC_SIZE, win_length=None):
+        if win_length is None:
+            win_length = size
+        if not 1 <= win_length <= size:
+            raise ValueError(f'Win length must be between 1 and {size}')
+
+        self.size = size
+        self.win_length = win_length
+        self.square_count = size * size
+        self.marked_count = 0
+        self.winners = set()
+        self.masks = {Square.HUMAN_MARKER: 0, Square.COMPUTER_MARKER: 0}
+        # Per-square copy of the masks so line walks on large boards do
+        # not have to shift whole-board integers.
+        self.cells = [Square.INITIAL_MARKER] * self.square_count
+
+    def is_classic(self):
+        return (self.size == Board.CLASSIC_SIZE and
+                self.win_length == Board.CLASSIC_SIZE)
+
+    def occupied_mask(self):
+        return (self.masks[Square.HUMAN_MARKER] |
+                self.masks[Square.COMPUTER_MARKER])
+
+    def marker_at(self, key):
+        return self.cells[key - 1]
 
     def unused_squares(self):
-        return [key for key, square in self.squares.items()
-                if square.is_unused()]
-
-    def display(self):
-        empty_line = f'     |     |     '
-        horizontal_line = f'-----+-----+-----'
-
-        print()
-        print(empty_line)
-        print(f'  {self.squares[1]}  |'
-              f'  {self.squares[2]}  |'
-              f'  {self.squares[3]}  ')
-        print(empty_line)
-        print(horizontal_line)
-        print(empty_line)
-        print(f'  {self.squares[4]}  |'
-              f'  {self.squares[5]}  |'
-              f'  {self.squares[6]}  ')
-        print(empty_line)
-        print(horizontal_line)
-        print(empty_line)
-        print(f'  {self.squares[7]}  |'
-              f'  {self.squares[8]}  |'
-              f'  {self.squares[9]}  ')
-        print(empty_line)
-        print()
+        return [index + 1 for index, marker in enumerate(self.cells)
+                if marker == Square.INITIAL_MARKER]
+
+    def display(self, write=print):
+        empty_line = '|'.join(['     '] * self.size)
+        horizontal_line = '+'.join(['-----'] * self.size)
+
+        write()
+        for row in range(self.size):
+            if row > 0:
+                write(horizontal_line)
+
+            first_key = row * self.size + 1
+            write(empty_line)
+            write('|'.join(f'  {self.marker_at(key)}  ' for key in
+                           range(first_key, first_key + self.size)))
+            write(empty_line)
+        write()
 
     def mark_square_at(self, key, marker):
-        self.squares[key].marker = marker
+        bit = 1 << (key - 1)
+        previous = self.cells[key - 1]
+        was_used = previous != Square.INITIAL_MARKER
+        if was_used:
+            self.masks[previous] &= ~bit
+        self.cells[key - 1] = marker
+
+        if marker == Square.INITIAL_MARKER:
+            if was_used:
+                self.marked_count -= 1
+                self._recount_winners()
+            return
+
+        if not was_used:
+            self.marked_count += 1
+        self.masks[marker] |= bit
+
+        if was_used:
+            self._recount_winners()
+        elif self.completes_line(key, marker):
+            self.winners.add(marker)
+
+    def completes_line(self, key, marker):
+        return Board.line_through(self.cells, self.size, self.win_length,
+                                  key - 1, marker)
+
+    @staticmethod
+    def line_through(cells, size, win_length, index, marker):
+        # Only the four lines through `index` can have changed, and each is
+        # walked at most `win_length` squares, whatever the board size.
+        row, col = divmod(index, size)
+
+        for row_step, col_step in Board.LINE_DIRECTIONS:
+            run = 1
+            for direction in (1, -1):
+                next_row = row + row_step * direction
+                next_col = col + col_step * direction
+                while (run < win_length and
+                       0 <= next_row < size and
+                       0 <= next_col < size and
+                       cells[next_row * size + next_col] == marker):
+                    run += 1
+                    next_row += row_step * direction
+                    next_col += col_step * direction
+
+            if run >= win_length:
+                return True
+
+        return False
+
+    def _recount_winners(self):
+        self.winners = set()
+        for index, marker in enumerate(self.cells):
+            if (marker != Square.INITIAL_MARKER and
+                    marker not in self.winners and
+                    self.completes_line(index + 1, marker)):
+                self.winners.add(marker)
 
     def is_full(self):
-        return self.unused_squares() == []
-    
+        return self.marked_count == self.square_count
+
+    def has_winning_row(self, marker):
+        return marker in self.winners
+
+    @staticmethod
+    def is_winning_mask(mask):
+        for winning_mask in Board.WINNING_MASKS:
+            if mask & winning_mask == winning_mask:
+                return True
+
+        return False
+
     def count_markers_for(self, player, keys):
-        markers = [self.squares[key].marker for key in keys]
-        return markers.count(player.marker)
+        keys_mask = sum(1 << (key - 1) for key in keys)
+        return (self.masks[player.marker] & keys_mask).bit_count()
 
 class Player:
     def __init__(self, marker):
@@ -98,75 +209,442 @@ class Human(Player):
         super().__init__(Square.HUMAN_MARKER)
 
 class Computer(Player):
-    def __init__(self):
-        super().__init__(Square.COMPUTER_MARKER)
+    STRATEGIES = ('random', 'minimax', 'book', 'mcts')
+    CLASSIC_ONLY_STRATEGIES = ('minimax', 'book')
+
+    def __init__(self, strategy='random', seed=None,
+                 marker=Square.COMPUTER_MARKER,
+                 mcts_iterations=None, mcts_seconds=None):
+        super().__init__(marker)
+        if strategy not in Computer.STRATEGIES:
+            raise ValueError(f'Unknown strategy: {strategy}')
+
+        self.strategy = strategy
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.search = None
+        if strategy == 'mcts':
+            self.search = MonteCarloSearch(marker, self.random,
+                                           mcts_iterations, mcts_seconds)
+
+    def choose_square(self, board):
+        if (self.strategy in Computer.CLASSIC_ONLY_STRATEGIES and
+                not board.is_classic()):
+            raise ValueError(f'The {self.strategy} strategy only supports '
+                             f'the classic 3x3 board')
+
+        if self.strategy == 'mcts':
+            return self.search.best_square(board)
+        if self.strategy == 'minimax':
+            return MinimaxSearch.best_square(board, self.marker, self.seed)
+        if self.strategy == 'book':
+            return OpeningBook.best_square(board, self.marker)
+
+        return self.random.choice(board.unused_squares())
+
+class MonteCarloNode:
+    def __init__(self, parent, index, marker, untried):
+        self.parent = parent
+        self.index = index
+        self.marker = marker
+        self.untried = untried
+        self.children = {}
+        self.visits = 0
+        self.score = 0.0
+        self.is_terminal = False
+
+    def best_child(self, exploration):
+        log_visits = math.log(self.visits)
+        return max(self.children.values(),
+                   key=lambda child: (child.score / child.visits +
+                                      exploration *
+                                      math.sqrt(log_visits / child.visits)))
+
+class MonteCarloSearch:
+    DEFAULT_ITERATIONS = 2000
+    EXPLORATION = math.sqrt(2)
+
+    def __init__(self, marker, rng, iterations=None, seconds=None):
+        if iterations is None and seconds is None:
+            iterations = MonteCarloSearch.DEFAULT_ITERATIONS
 
-class TTTGame(DisplayMixin):
+        self.marker = marker
+        self.opponent = MonteCarloSearch._other(marker)
+        self.random = rng
+        self.iterations = iterations
+        self.seconds = seconds
+        self.root = None
+        self.root_cells = None
+        self.playouts = 0
+        self.playout_seconds = 0.0
 
-    POSSIBLE_WINNING_ROWS = (
-        (1, 2, 3),
-        (4, 5, 6),
-        (7, 8, 9),
-        (1, 4, 7),
-        (2, 5, 8),
-        (3, 6, 9),
-        (1, 5, 9),
-        (3, 5, 7),
+    @property
+    def playouts_per_second(self):
+        if not self.playout_seconds:
+            return 0.0
+        return self.playouts / self.playout_seconds
+
+    def best_square(self, board):
+        self._reroot(board)
+
+        start = time.perf_counter()
+        deadline = start + self.seconds if self.seconds else None
+        # Always search once, so a zero or used-up budget still expands a
+        # legal square to choose from.
+        self._iterate(board.size, board.win_length)
+        iteration = 1
+        while ((self.iterations is None or iteration < self.iterations) and
+               (deadline is None or time.perf_counter() < deadline)):
+            self._iterate(board.size, board.win_length)
+            iteration += 1
+        self.playouts += iteration
+        self.playout_seconds += time.perf_counter() - start
+
+        best = max(self.root.children.values(),
+                   key=lambda child: child.visits)
+        self._advance(best.index)
+        return best.index + 1
+
+    def _reroot(self, board):
+        # Keep the subtree for the position actually on the board if the
+        # only change since our last move is one opponent square we have
+        # already explored.
+        if self.root is not None:
+            changed = [index for index, marker in enumerate(board.cells)
+                       if marker != self.root_cells[index]]
+            if (len(changed) == 1 and
+                    board.cells[changed[0]] == self.opponent and
+                    changed[0] in self.root.children):
+                self._advance(changed[0])
+                return
+
+        self.root_cells = list(board.cells)
+        self.root = MonteCarloNode(None, None, self.opponent,
+                                   self._empty_indexes(self.root_cells))
+
+    def _advance(self, index):
+        child = self.root.children.get(index)
+        if child is None:
+            child = MonteCarloNode(None, index,
+                                   self._other(self.root.marker), [])
+        child.parent = None
+        self.root = child
+        self.root_cells[index] = child.marker
+        if not child.untried and not child.children:
+            child.untried = self._empty_indexes(self.root_cells)
+
+    def _iterate(self, size, win_length):
+        cells = list(self.root_cells)
+        node = self.root
+
+        while not node.untried and node.children and not node.is_terminal:
+            node = node.best_child(MonteCarloSearch.EXPLORATION)
+            cells[node.index] = node.marker
+
+        if node.untried and not node.is_terminal:
+            position = self.random.randrange(len(node.untried))
+            node.untried[position], node.untried[-1] = (node.untried[-1],
+                                                        node.untried[position])
+            index = node.untried.pop()
+            marker = self._other(node.marker)
+            cells[index] = marker
+            child = MonteCarloNode(node, index, marker,
+                                   self._empty_indexes(cells))
+            child.is_terminal = (
+                Board.line_through(cells, size, win_length, index, marker) or
+                not child.untried)
+            node.children[index] = child
+            node = child
+
+        if node.is_terminal:
+            winner = (node.marker
+                      if Board.line_through(cells, size, win_length,
+                                            node.index, node.marker)
+                      else None)
+        else:
+            winner = self._playout(cells, size, win_length, node.marker)
+
+        while node is not None:
+            node.visits += 1
+            if winner == node.marker:
+                node.score += 1.0
+            elif winner is None:
+                node.score += 0.5
+            node = node.parent
+
+    def _playout(self, cells, size, win_length, last_marker):
+        empty = self._empty_indexes(cells)
+        self.random.shuffle(empty)
+        marker = last_marker
+        for index in empty:
+            marker = MonteCarloSearch._other(marker)
+            cells[index] = marker
+            if Board.line_through(cells, size, win_length, index, marker):
+                return marker
+
+        return None
+
+    @staticmethod
+    def _other(marker):
+        if marker == Square.COMPUTER_MARKER:
+            return Square.HUMAN_MARKER
+        return Square.COMPUTER_MARKER
+
+    @staticmethod
+    def _empty_indexes(cells):
+        return [index for index, marker in enumerate(cells)
+                if marker == Square.INITIAL_MARKER]
+
+class MinimaxSearch:
+    # Shared by every Computer in the process, so positions solved during
+    # one move or game never need to be searched again.
+    transpositions = {}
+
+    EXACT = 0
+    LOWER_BOUND = 1
+    UPPER_BOUND = 2
+
+    @classmethod
+    def best_square(cls, board, marker, seed=None):
+        own = board.masks[marker]
+        other = board.occupied_mask() & ~own
+
+        best_score = None
+        best_keys = []
+        for key in board.unused_squares():
+            bit = Board.SQUARE_BITS[key]
+            score = -cls.negamax(other, own | bit, -math.inf, math.inf)
+            if best_score is None or score > best_score:
+                best_score = score
+                best_keys = [key]
+            elif score == best_score:
+                best_keys.append(key)
+
+        if seed is None:
+            return best_keys[0]
+
+        chooser = random.Random(seed << 18 | own << 9 | other)
+        return chooser.choice(best_keys)
+
+    @classmethod
+    def negamax(cls, own, other, alpha, beta):
+        # Scores are from the point of view of the side to move (`own`).
+        # Quicker wins score higher than slower ones.
+        occupied = own | other
+        empty_count = 9 - occupied.bit_count()
+        if Board.is_winning_mask(other):
+            return -(empty_count + 1)
+        if occupied == Board.FULL_MASK:
+            return 0
+
+        original_alpha = alpha
+        entry = cls.transpositions.get((own, other))
+        if entry is not None:
+            value, flag = entry
+            if flag == cls.EXACT:
+                return value
+            if flag == cls.LOWER_BOUND:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        best = -math.inf
+        for bit in Board.SQUARE_BITS.values():
+            if occupied & bit:
+                continue
+
+            best = max(best, -cls.negamax(other, own | bit, -beta, -alpha))
+            alpha = max(alpha, best)
+            if alpha >= beta:
+                break
+
+        if best <= original_alpha:
+            flag = cls.UPPER_BOUND
+        elif best >= beta:
+            flag = cls.LOWER_BOUND
+        else:
+            flag = cls.EXACT
+        cls.transpositions[(own, other)] = (best, flag)
+
+        return best
+
+class OpeningBook:
+    PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'ttt_book.bin')
+
+    # One byte per base-3 encoded position: 0 for a finished position,
+    # otherwise the best square (1-9) for the side to move.
+    SIZE = 3 ** 9
+    NO_MOVE = 0
+
+    # Each tuple maps a square index (0-8) to its index after one of the
+    # 4 rotations, with and without a mirror, of the 3x3 grid.
+    SYMMETRIES = (
+        (0, 1, 2, 3, 4, 5, 6, 7, 8),
+        (2, 1, 0, 5, 4, 3, 8, 7, 6),
+        (2, 5, 8, 1, 4, 7, 0, 3, 6),
+        (0, 3, 6, 1, 4, 7, 2, 5, 8),
+        (8, 7, 6, 5, 4, 3, 2, 1, 0),
+        (6, 7, 8, 3, 4, 5, 0, 1, 2),
+        (6, 3, 0, 7, 4, 1, 8, 5, 2),
+        (8, 5, 2, 7, 4, 1, 6, 3, 0),
     )
 
-    def __init__(self):
-        self.board = Board()
+    _table = None
+
+    @classmethod
+    def best_square(cls, board, marker):
+        if cls._table is None:
+            cls._table = cls.load()
+
+        own = board.masks[marker]
+        other = board.occupied_mask() & ~own
+        code, symmetry = cls.canonical(own, other)
+        return symmetry.index(cls._table[code] - 1) + 1
+
+    @classmethod
+    def ensure_built(cls, path=None):
+        path = path or cls.PATH
+        if not os.path.exists(path):
+            cls.build(path)
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or cls.PATH
+        cls.ensure_built(path)
+
+        table = array('B')
+        with open(path, 'rb') as book_file:
+            table.fromfile(book_file, cls.SIZE)
+
+        return table
+
+    @classmethod
+    def build(cls, path=None):
+        path = path or cls.PATH
+        table = array('B', bytes(cls.SIZE))
+        seen = set()
+        cls._solve_reachable(0, 0, table, seen)
+
+        with atomic_write(path) as book_file:
+            table.tofile(book_file)
+
+        return len(seen)
+
+    @classmethod
+    def _solve_reachable(cls, own, other, table, seen):
+        occupied = own | other
+        if Board.is_winning_mask(other) or occupied == Board.FULL_MASK:
+            return
+
+        code, symmetry = cls.canonical(own, other)
+        if code in seen:
+            return
+        seen.add(code)
+
+        best_score = None
+        for key, bit in Board.SQUARE_BITS.items():
+            if occupied & bit:
+                continue
+
+            score = -MinimaxSearch.negamax(other, own | bit,
+                                           -math.inf, math.inf)
+            if best_score is None or score > best_score:
+                best_score = score
+                table[code] = symmetry[key - 1] + 1
+
+            cls._solve_reachable(other, own | bit, table, seen)
+
+    @classmethod
+    def canonical(cls, own, other):
+        best = None
+        for symmetry in cls.SYMMETRIES:
+            code = cls.encode(own, other, symmetry)
+            if best is None or code < best[0]:
+                best = (code, symmetry)
+
+        return best
+
+    @staticmethod
+    def encode(own, other, symmetry):
+        code = 0
+        for index, target in enumerate(symmetry):
+            bit = 1 << index
+            if own & bit:
+                code += 3 ** target
+            elif other & bit:
+                code += 2 * 3 ** target
+
+        return code
+
+class TTTGame(DisplayMixin):
+
+    POSSIBLE_WINNING_ROWS = Board.POSSIBLE_WINNING_ROWS
+
+    def __init__(self, computer_strategy='random', seed=None,
+                 size=Board.CLASSIC_SIZE, win_length=None, driver=None,
+                 renderer=None, mcts_iterations=None, mcts_seconds=None):
+        self.driver = driver or ConsoleDriver()
+        self.renderer = renderer or self.driver.renderer()
+        self.board = Board(size, win_length)
         self.human = Human()
-        self.computer = Computer()
+        self.computer = Computer(computer_strategy, seed,
+                                 mcts_iterations=mcts_iterations,
+                                 mcts_seconds=mcts_seconds)
 
     def play(self):
         # SPIKE
-        self.display_welcome_message()
+        with self.driver.session():
+            if self.computer.seed is None:
+                # Seed the computer from the global random state, which a
+                # RecordingDriver saves and a ReplayDriver restores.
+                self.computer.random.seed(random.getrandbits(64))
+            self.clear_screen()
 
-        while True:
-            self.board.display()
+            while True:
+                self.display_board()
 
-            self.human_moves()
-            self.clear_screen()
-            if self.is_game_over():
-                break
+                self.human_moves()
+                if self.is_game_over():
+                    break
 
-            self.computer_moves()
-            self.clear_screen()
-            if self.is_game_over():
-                break
-        
-        self.board.display()
-        self.display_results()
-        self.display_goodbye_message()
+                self.computer_moves()
+                if self.is_game_over():
+                    break
+
+            self.display_board()
+            self.display_results()
+            self.display_goodbye_message()
+
+    def display_board(self):
+        with self.driver.frame(self.renderer):
+            self.display_welcome_message()
+            self.board.display(self.driver.write)
     
     def display_welcome_message(self):
-        self.clear_screen()
-        print('Welcome to Tic Tac Toe!')
+        self.driver.write('Welcome to Tic Tac Toe!')
 
     def display_goodbye_message(self):
-        print('Thanks for playing Tic Tac Toe! Goodbye :)')
+        self.driver.write('Thanks for playing Tic Tac Toe! Goodbye :)')
 
     def display_results(self):
         if self.is_winner(self.human):
-            print('You won! Congratulations!')
+            self.driver.write('You won! Congratulations!')
         elif self.is_winner(self.computer):
-            print('I won! I won! Take that, human!')
+            self.driver.write('I won! I won! Take that, human!')
         else:
-            print('A tie game. How boring.')
+            self.driver.write('A tie game. How boring.')
 
     def is_winner(self, player):
-        for row in TTTGame.POSSIBLE_WINNING_ROWS:
-            if self.three_in_a_row(player, row):
-                return True
-        
-        return False
+        return self.board.has_winning_row(player.marker)
 
     def human_moves(self):
         while True:
             valid_choices = self.board.unused_squares()
             choices_list = self.join_or([str(num) for num in valid_choices])
-            choice = input(f'Choose a square: ({choices_list}) ')
+            choice = self.driver.read(f'Choose a square: ({choices_list}) ')
 
             try:
                 choice = int(choice)
@@ -176,13 +654,12 @@ class TTTGame(DisplayMixin):
                 if choice in valid_choices:
                     break
 
-            print('Sorry, that\'s not a valid choice\n')
+            self.driver.write('Sorry, that\'s not a valid choice\n')
 
         self.board.mark_square_at(choice, self.human.marker)
 
     def computer_moves(self):
-        valid_choices = self.board.unused_squares()
-        choice = random.choice(valid_choices)
+        choice = self.computer.choose_square(self.board)
         self.board.mark_square_at(choice, self.computer.marker)
 
     def is_game_over(self):
@@ -193,7 +670,11 @@ class TTTGame(DisplayMixin):
                 self.is_winner(self.computer))
     
     def three_in_a_row(self, player, row):
-        return self.board.count_markers_for(player, row) == 3
+        return (self.board.count_markers_for(player, row) ==
+                self.board.win_length)
+
+def main():
+    TTTGame().play()
 
-game = TTTGame()
-game.play()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
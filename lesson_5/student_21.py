@@ -1,26 +1,49 @@
 """ OO Twenty One Game"""
 import random
-import os
 import sys
 
-def clear_screen():
-    """Clear screen """
-    os.system('clear')
+from drivers import ConsoleDriver
 
 class Card:
-    """Card Class"""
+    """Card Class: immutable, one shared instance per rank and suit"""
     SUITS = ("\u2663", "\u2665",
          "\u2666", "\u2660")
     RANKS = ('A', '2', '3', '4', '5',
          '6', '7', '8', '9', '10',
          'J', 'Q', 'K')
 
-    def __init__(self, rank, suit):
-        self.rank = rank
-        self.suit = suit
-        self._hidden = False
+    __slots__ = ('_rank', '_suit', '_value', '_is_ace')
+    _interned = {}
+    _art = {}
 
-    def get_value(self):
+    def __new__(cls, rank, suit):
+        card = cls._interned.get((rank, suit))
+        if card is None:
+            card = super().__new__(cls)
+            object.__setattr__(card, '_rank', rank)
+            object.__setattr__(card, '_suit', suit)
+            object.__setattr__(card, '_is_ace', rank == 'A')
+            object.__setattr__(card, '_value', card._compute_value())
+            cls._interned[(rank, suit)] = card
+        return card
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Cards are immutable')
+
+    def __reduce__(self):
+        return (Card, (self._rank, self._suit))
+
+    @property
+    def rank(self):
+        """Getter for rank"""
+        return self._rank
+
+    @property
+    def suit(self):
+        """Getter for suit"""
+        return self._suit
+
+    def _compute_value(self):
         """Determine card value"""
         if self.is_face_card():
             return 10
@@ -28,30 +51,29 @@ class Card:
             return 11
         return int(self.rank)
 
+    def get_value(self):
+        """Get card value"""
+        return self._value
+
     def is_ace(self):
         """Determine card if ace"""
-        return self.rank == 'A'
+        return self._is_ace
 
     def is_face_card(self):
         """Determine card if J, Q, K """
         return self.rank in ['J', 'Q', 'K']
 
-    def hide(self):
-        """Hide card"""
-        self._hidden = True
-
-    def reveal(self):
-        """Reveal card"""
-        self._hidden = False
-
-    @property
-    def hidden(self):
-        """Getter for hidden variable"""
-        return self._hidden
-
-    def display(self):
+    def display(self, hidden=False):
         """Return visual representation of a single card"""
-        if self.hidden:
+        key = (self.rank, self.suit, hidden)
+        art = Card._art.get(key)
+        if art is None:
+            art = Card._art[key] = self._draw(hidden)
+        return art
+
+    def _draw(self, hidden):
+        """Build the lines of the card's art"""
+        if hidden:
             rank, suit = "?", "?"
         else:
             rank, suit = self.rank, self.suit
@@ -66,55 +88,89 @@ class Card:
 
         return rank_line1, empty_line, suit_line, empty_line, rank_line2
 
+# The 52 shared cards, created once at import.
+Card.ALL = tuple(Card(rank, suit)
+                 for suit in Card.SUITS
+                 for rank in Card.RANKS)
+
 class Deck:
-    """Deck Class"""
+    """Deck Class: a reusable shuffled order of the shared cards"""
     def __init__(self):
-        self.cards = [Card(rank, suit)
-                for suit in Card.SUITS
-                for rank in Card.RANKS]
-
+        self.cards = list(Card.ALL)
         self.shuffle_deck()
 
     def shuffle_deck(self):
-        """Shuffle deck"""
+        """Shuffle deck in place and start dealing from the top again"""
         random.shuffle(self.cards)
+        self._next = len(self.cards)
 
     def deal_card(self):
         """Deal a card"""
-        return self.cards.pop()
+        self._next -= 1
+        return self.cards[self._next]
 
 class Hand:
-    """Hand Class"""
+    """Hand Class: keeps its totals up to date as cards are added"""
     def __init__(self):
         self.cards = []
+        self._hidden = set()
+        self.reset()
 
     def add_card(self, card):
         """Add a card"""
         self.cards.append(card)
+        self._total += card.get_value()
+        if card.is_ace():
+            self._soft_aces += 1
+
+        while self._total > TwentyOneGame.TARGET_SCORE and self._soft_aces:
+            self._total -= 10
+            self._soft_aces -= 1
+
+        self._visible_total = None
 
     def get_hand_total(self):
         """Get total of cards in hand"""
-        total = sum(card.get_value() for card in self.cards)
-        aces = sum(1 for card in self.cards if card.is_ace())
+        return self._total
 
-        while total > TwentyOneGame.TARGET_SCORE and aces:
-            total -= 10
-            aces -= 1
+    def get_visible_total(self):
+        """Get total of the cards that are not hidden"""
+        if self._visible_total is None:
+            self._visible_total = sum(
+                card.get_value() for index, card in enumerate(self.cards)
+                if index not in self._hidden)
+        return self._visible_total
 
-        return total
+    def is_hidden(self, index):
+        """Check if the card at `index` is dealt face down"""
+        return index in self._hidden
 
     def is_busted(self):
         """Check if hand total is greater than target score"""
         return self.get_hand_total() > TwentyOneGame.TARGET_SCORE
 
+    def is_soft(self):
+        """Check if an ace is still counted as 11 in the hand total"""
+        return self._soft_aces > 0
+
+    def hide_card(self, index):
+        """Hide one card"""
+        self._hidden.add(index)
+        self._visible_total = None
+
     def reveal_cards(self):
         """Reveal card"""
-        for card in self.cards:
-            card.reveal()
+        self._hidden.clear()
+        self._visible_total = None
 
     def reset(self):
         """Reset cards"""
-        self.cards = []
+        # Cleared in place so replaying rounds does not allocate new lists.
+        self.cards.clear()
+        self._hidden.clear()
+        self._total = 0
+        self._soft_aces = 0
+        self._visible_total = 0
 
     def __str__(self):
         return self.display_cards()
@@ -123,20 +179,15 @@ class Hand:
         """ Display cards in hand"""
         buffer = ' ' * 3
         card_line = (buffer + '+---------+') * len(self.cards)
-        rank_line1 = empty_line1 = suit_line = empty_line2 = rank_line2 = ''
+        arts = [card.display(index in self._hidden)
+                for index, card in enumerate(self.cards)]
 
-        for card in self.cards:
-            r1, e1, s, e2, r2 = card.display()
-            rank_line1 += buffer + r1
-            empty_line1 += buffer + e1
-            suit_line += buffer + s
-            empty_line2 += buffer + e2
-            rank_line2 += buffer + r2
+        # Card art is cached, so each row is just one join of cached lines.
+        rows = [buffer + buffer.join(lines) for lines in zip(*arts)]
+        if not rows:
+            rows = [''] * 5
 
-        result = "\n".join([card_line, rank_line1,
-                            empty_line1, suit_line,
-                            empty_line2, rank_line2,
-                            card_line])
+        result = "\n".join([card_line, *rows, card_line])
 
         return result
 
@@ -158,9 +209,9 @@ class Participant:
         """Get total hand score"""
         return self.hand.get_hand_total()
 
-    def show_hand(self):
+    def show_hand(self, write=print):
         """Print the hand"""
-        print(self.hand)
+        write(self.hand)
 
     def reveal_hand(self):
         """Reveal all hidden cards"""
@@ -182,9 +233,9 @@ class Wallet:
         """Adjust player's money by a given amount."""
         self.money += amount
 
-    def display(self):
+    def display(self, write=print):
         """Display player's current money."""
-        print(f"\nYou have ${self.money}.")
+        write(f"\nYou have ${self.money}.")
 
     def is_bankrupt(self):
         """Check if player is bankrupt."""
@@ -196,17 +247,30 @@ class Wallet:
 
 class Player(Participant):
     """Player Class: Inherits Participant with wallet management."""
-    def __init__(self):
+    def __init__(self, record_decisions=False):
         super().__init__()
         self.wallet = Wallet()
+        # Only kept when asked for, so long automatic runs stay flat.
+        self.decisions = [] if record_decisions else None
+
+    def decide(self, dealer_upcard):
+        """Return 'h' or 's' to play automatically, None to ask the user"""
+        return None
+
+    def record_decision(self, dealer_upcard, choice):
+        """Remember a hit/stay choice with the situation it was made in"""
+        if self.decisions is None:
+            return
+        self.decisions.append((self.hand_total, self.hand.is_soft(),
+                               dealer_upcard, choice))
 
     def adjust_money(self, amount):
         """Delegate money adjustment to Wallet."""
         self.wallet.adjust(amount)
 
-    def display_money(self):
+    def display_money(self, write=print):
         """Delegate display of money to Wallet."""
-        self.wallet.display()
+        self.wallet.display(write)
 
     def is_bankrupt(self):
         """Delegate bankrupt check to Wallet."""
@@ -227,7 +291,7 @@ class Dealer(Participant):
     def hide_second_card(self):
         """Hide dealer's second card"""
         if len(self.hand.cards) > 1:
-            self.hand.cards[1].hide()
+            self.hand.hide_card(1)
 
 class Scoreboard:
     """Scoreboard Class"""
@@ -245,36 +309,47 @@ class Scoreboard:
 
 class UserInterface:
     """Handles displaying messages, menus, and input."""
-    @staticmethod
-    def display_welcome_message():
+    def __init__(self, driver, renderer):
+        self.driver = driver
+        self.renderer = renderer
+
+    def clear_screen(self):
+        """Clear screen """
+        self.renderer.clear()
+
+    def display_welcome_message(self):
         """Display welcome message"""
-        clear_screen()
-        print(f"Welcome to {TwentyOneGame.TARGET_SCORE}! Let's get started!")
+        self.clear_screen()
+        self.driver.write(f"Welcome to {TwentyOneGame.TARGET_SCORE}! "
+                          "Let's get started!")
 
-    @staticmethod
-    def display_goodbye_message():
+    def display_goodbye_message(self):
         """Display goodbye message when exiting the game"""
-        print("Thanks for playing! Goodbye.")
+        self.driver.write("Thanks for playing! Goodbye.")
 
-    @staticmethod
-    def display_instructions():
+    def display_instructions(self):
         """Display game instructions"""
-        clear_screen()
-        print(f"The goal is to get as close to "
-              f"{TwentyOneGame.TARGET_SCORE} as possible without going over.")
-        print("Each player starts with 2 cards. "
-              "One of the dealer's cards will be hidden.")
-        print("On your turn, you can choose:")
-        print("  - 'Hit' to get another card.")
-        print("  - 'Stay' to keep your current hand.")
-        print(f"If your total exceeds {TwentyOneGame.TARGET_SCORE}, "
-              f"you 'bust' and lose automatically.")        
-        print(f"The dealer will hit until reaching "
-              f"at least {Dealer.DEALER_MUST_STAY_SCORE}.\n")
-        print(f"Each bet costs $1. You start with ${Wallet.INITIAL_AMOUNT}.")
-        print("Try to manage your money and avoid losing everything.")
-        print("Game ends when you have no money left or you have $10.\n")
-        print("Good luck!")
+        self.clear_screen()
+        self.driver.write(f"The goal is to get as close to "
+                          f"{TwentyOneGame.TARGET_SCORE} as possible "
+                          "without going over.")
+        self.driver.write("Each player starts with 2 cards. "
+                          "One of the dealer's cards will be hidden.")
+        self.driver.write("On your turn, you can choose:")
+        self.driver.write("  - 'Hit' to get another card.")
+        self.driver.write("  - 'Stay' to keep your current hand.")
+        self.driver.write(f"If your total exceeds "
+                          f"{TwentyOneGame.TARGET_SCORE}, "
+                          "you 'bust' and lose automatically.")
+        self.driver.write(f"The dealer will hit until reaching "
+                          f"at least {Dealer.DEALER_MUST_STAY_SCORE}.\n")
+        self.driver.write(f"Each bet costs $1. "
+                          f"You start with ${Wallet.INITIAL_AMOUNT}.")
+        self.driver.write("Try to manage your money "
+                          "and avoid losing everything.")
+        self.driver.write("Game ends when you have no money left "
+                          "or you have $10.\n")
+        self.driver.write("Good luck!")
 
 class TwentyOneGame:
     """Twenty One Game Class"""
@@ -285,32 +360,41 @@ class TwentyOneGame:
     PLAYER_WINS_MSG = "You win!"
     TIE_MSG = "It's a tie!"
 
-    def __init__(self):
+    def __init__(self, player=None, driver=None, renderer=None):
+        self.driver = driver or ConsoleDriver()
+        self.renderer = renderer or self.driver.renderer()
         self.deck = Deck()
-        self.player = Player()
+        self.player = player or Player()
         self.dealer = Dealer()
         self.scoreboard = Scoreboard()
-        self.ui = UserInterface()
+        self.ui = UserInterface(self.driver, self.renderer)
+
+    def clear_screen(self):
+        """Clear screen """
+        self.renderer.clear()
 
     def start(self):
         """Start the game loop"""
-        self.ui.display_welcome_message()
-        self.display_main_menu()
-        while not self.is_game_over():
-            self.play_one_round()
-            if self.is_game_over():
-                break
-            if not self.play_again():
-                break
-        self.ui.display_goodbye_message()
+        with self.driver.session():
+            # A fresh deck, so a replayed session shuffles the same order
+            self.deck = Deck()
+            self.ui.display_welcome_message()
+            self.display_main_menu()
+            while not self.is_game_over():
+                self.play_one_round()
+                if self.is_game_over():
+                    break
+                if not self.play_again():
+                    break
+            self.ui.display_goodbye_message()
 
     def play_one_round(self):
         """Play a single round"""
         self.player.reset_hand()
         self.dealer.reset_hand()
-        self.deck = Deck()
+        self.deck.shuffle_deck()
         self.deal_initial_cards()
-        clear_screen()
+        self.clear_screen()
         self.player_turn()
 
         if not self.player.is_busted():
@@ -328,19 +412,19 @@ class TwentyOneGame:
 
     def show_cards(self):
         """Show both player's and dealer's hands"""
-        print(f"Dealer's hand: ({self.display_dealer_total()})")
-        print(self.dealer.hand)
+        self.driver.write(f"Dealer's hand: ({self.display_dealer_total()})")
+        self.driver.write(self.dealer.hand)
 
-        print(f"\nYour hand: ({self.display_player_total()})")
-        print(self.player.hand)
+        self.driver.write(f"\nYour hand: ({self.display_player_total()})")
+        self.driver.write(self.player.hand)
 
     def player_turn(self):
         """Handle player's turn"""
         while True:
-            clear_screen()
-            self.show_cards()
-            self.player.display_money()
-            print()
+            with self.driver.frame(self.renderer):
+                self.show_cards()
+                self.player.display_money(self.driver.write)
+                self.driver.write()
 
             choice = self.get_player_choice()
 
@@ -357,43 +441,47 @@ class TwentyOneGame:
 
     def get_player_choice(self):
         """Get the player's selection (hit, stay, quit)"""
-        while True:
-            choice = input("Press (H) for hit, "
-                               "(S) for stay, or (Q) to quit: ").lower()
-            if choice in ['h', 's', 'q']:
-                return choice
-            input("Invalid choice. Press Enter to try again: ")
+        dealer_upcard = self.dealer.hand.cards[0]
+        choice = self.player.decide(dealer_upcard)
+        while choice is None:
+            choice = self.driver.read("Press (H) for hit, "
+                                      "(S) for stay, or (Q) to quit: ").lower()
+            if choice not in ['h', 's', 'q']:
+                self.driver.read("Invalid choice. Press Enter to try again: ")
+                choice = None
+
+        if choice in ['h', 's']:
+            self.player.record_decision(dealer_upcard, choice)
+        return choice
 
     def dealer_turn(self):
         """Handle the dealer's turn"""
-        clear_screen()
-        print("Dealer's turn... ")
+        self.clear_screen()
+        self.driver.write("Dealer's turn... ")
         self.dealer.reveal_hand()
-        self.dealer.show_hand()
+        self.dealer.show_hand(self.driver.write)
 
         while self.dealer.should_hit():
-            print("Dealer hits...")
+            self.driver.write("Dealer hits...")
             self.dealer.draw_card(self.deck)
-            self.dealer.show_hand()
+            self.dealer.show_hand(self.driver.write)
 
             if self.dealer.is_busted():
                 self.handle_bust(self.dealer)
                 return
 
-        print("Dealer stays.")
+        self.driver.write("Dealer stays.")
 
     def handle_bust(self, participant):
         """Handle bust scenario"""
         if isinstance(participant, Player):
-            print("\nYou busted! Dealer wins.")
+            self.driver.write("\nYou busted! Dealer wins.")
         elif isinstance(participant, Dealer):
-            print("\nDealer busted! You win.")
+            self.driver.write("\nDealer busted! You win.")
 
     def display_dealer_total(self):
         """Display the total for dealer's revealed cards"""
-        revealed_cards = [card for card in self.dealer.hand.cards if not card.hidden]
-        total = sum(card.get_value() for card in revealed_cards)
-        return str(total)
+        return str(self.dealer.hand.get_visible_total())
 
     def display_player_total(self):
         """Display the total of the player's hand"""
@@ -401,48 +489,50 @@ class TwentyOneGame:
 
     def display_round_result(self):
         """Display the result of the current round"""
-        clear_screen()
+        self.clear_screen()
         self.show_cards()
 
         if self.player.is_busted():
-            print(f"\n{self.BUST_MSG}")
+            self.driver.write(f"\n{self.BUST_MSG}")
             self.player.adjust_money(-1)
             self.scoreboard.update_score('Dealer')
         elif self.dealer.is_busted():
-            print(f"\n{self.DEALER_BUSTS_MSG}")
+            self.driver.write(f"\n{self.DEALER_BUSTS_MSG}")
             self.player.adjust_money(1)
             self.scoreboard.update_score('You')
         elif self.dealer.hand_total > self.player.hand_total:
-            print(f"\n{self.DEALER_WINS_MSG}")
+            self.driver.write(f"\n{self.DEALER_WINS_MSG}")
             self.player.adjust_money(-1)
             self.scoreboard.update_score('Dealer')
         elif self.player.hand_total > self.dealer.hand_total:
-            print(f"\n{self.PLAYER_WINS_MSG}")
+            self.driver.write(f"\n{self.PLAYER_WINS_MSG}")
             self.player.adjust_money(1)
             self.scoreboard.update_score('You')
         else:
-            print(f"\n{self.TIE_MSG}")
+            self.driver.write(f"\n{self.TIE_MSG}")
 
-        self.player.display_money()
+        self.player.display_money(self.driver.write)
 
     def play_again(self):
         """Ask the player if they want to play another round"""
-        print()
+        self.driver.write()
         while True:
-            choice = input("Do you want to play again (y/n): ").lower()
+            choice = self.driver.read("Do you want to play again (y/n): ")
+            choice = choice.lower()
             if choice in ['y', 'yes']:
                 return True
             if choice in ['n', 'no']:
                 return False
-            print("Invalid input. Please press 'y' for yes or 'n' for no.")
+            self.driver.write("Invalid input. "
+                              "Please press 'y' for yes or 'n' for no.")
 
     def is_game_over(self):
         """check if the game should end"""
         if self.player.is_bankrupt():
-            print("\nYou have no money left! Game over.")
+            self.driver.write("\nYou have no money left! Game over.")
             return True
         if self.player.has_won():
-            print("\nYou reached $10! You win!")
+            self.driver.write("\nYou reached $10! You win!")
             return True
         return False
 
@@ -457,14 +547,15 @@ class TwentyOneGame:
 
             banner_width = max(len(option) for option in options) + 4
 
-            print(f"\n+{'-' * banner_width}+")
-            print(f"| Menu{' ' * (banner_width - len('Menu') - 1)}|")
-            print(f"+{'-' * banner_width}+")
+            self.driver.write(f"\n+{'-' * banner_width}+")
+            padding = ' ' * (banner_width - len('Menu') - 1)
+            self.driver.write(f"| Menu{padding}|")
+            self.driver.write(f"+{'-' * banner_width}+")
             for option in options:
-                print(f"| {option.ljust(banner_width - 2)} |")
-            print(f"+{'-' * banner_width}+")
+                self.driver.write(f"| {option.ljust(banner_width - 2)} |")
+            self.driver.write(f"+{'-' * banner_width}+")
 
-            answer = input("\nChoose an option: ").lower()
+            answer = self.driver.read("\nChoose an option: ").lower()
             if answer == 's':
                 return
             if answer == 'i':
@@ -474,16 +565,20 @@ class TwentyOneGame:
                 self.ui.display_goodbye_message()
                 sys.exit()
 
-            print("\nInvalid choice, please try again.")
+            self.driver.write("\nInvalid choice, please try again.")
 
     def display_scoreboard(self):
         """Display the scoreboard"""
-        print("\n+--------------------+")
-        print(f"| Scoreboard{' ' * (19 - len('Scoreboard'))}|")
-        print("+--------------------+")
+        self.driver.write("\n+--------------------+")
+        self.driver.write(f"| Scoreboard{' ' * (19 - len('Scoreboard'))}|")
+        self.driver.write("+--------------------+")
         for key, value in self.scoreboard.scores.items():
-            print(f"| {key}: {value}{' ' * (19 - len(f'{key}: {value}'))}|")
-        print("+--------------------+")
+            entry = f'{key}: {value}'
+            self.driver.write(f"| {entry}{' ' * (19 - len(entry))}|")
+        self.driver.write("+--------------------+")
+
+def main():
+    TwentyOneGame().start()
 
-game = TwentyOneGame()
-game.start()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
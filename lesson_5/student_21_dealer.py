@@ -0,0 +1,158 @@
+""" Exact dealer outcome probabilities for the student_21 rules"""
+import argparse
+import json
+import os
+from fractions import Fraction
+from functools import cache
+
+from files import atomic_write
+from lesson_5.student_21 import Card, Dealer, TwentyOneGame
+
+BUST = 'bust'
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         'dealer_tables')
+
+ACE = 1
+SOFT_ACE_BONUS = 10
+# Hard card values, aces counted as 1; index 0 holds the aces.
+CARD_VALUES = tuple(range(1, 11))
+
+def deck_composition(decks=1):
+    """Number of cards of each hard value in `decks` decks"""
+    counts = [0] * len(CARD_VALUES)
+    for rank in Card.RANKS:
+        card = Card(rank, Card.SUITS[0])
+        value = ACE if card.is_ace() else card.get_value()
+        counts[value - 1] += len(Card.SUITS) * decks
+    return tuple(counts)
+
+def hand_total(hard_total, has_ace, target):
+    """Same result as Hand.get_hand_total: one ace counts 11 if it fits.
+
+    Only arithmetic and `&` are used, so it also works elementwise on numpy
+    arrays of totals and ace flags.
+    """
+    fits = has_ace & (hard_total + SOFT_ACE_BONUS <= target)
+    return hard_total + SOFT_ACE_BONUS * fits
+
+@cache
+def final_totals(hard_total, has_ace, composition, infinite, target, stay):
+    """Distribution of the dealer's final total from the given hand.
+
+    `composition` holds the cards left in the shoe. With `infinite` set it
+    only gives the card proportions and is never depleted.
+    """
+    if hard_total > target:
+        return {BUST: Fraction(1)}
+
+    total = hand_total(hard_total, has_ace, target)
+    remaining = sum(composition)
+    if total >= stay or remaining == 0:
+        return {total: Fraction(1)}
+
+    outcomes = {}
+    for index, count in enumerate(composition):
+        if not count:
+            continue
+
+        value = CARD_VALUES[index]
+        next_composition = composition
+        if not infinite:
+            next_composition = (composition[:index] + (count - 1,) +
+                                composition[index + 1:])
+
+        chance = Fraction(count, remaining)
+        for outcome, probability in final_totals(
+                hard_total + value, has_ace or value == ACE,
+                next_composition, infinite, target, stay).items():
+            outcomes[outcome] = (outcomes.get(outcome, 0) +
+                                 chance * probability)
+
+    return outcomes
+
+def compute_table(decks, target, stay):
+    """Final-total distribution for every dealer upcard"""
+    infinite = decks is None
+    shoe = deck_composition(1 if infinite else decks)
+    table = {}
+    for index, value in enumerate(CARD_VALUES):
+        composition = shoe
+        if not infinite:
+            composition = (shoe[:index] + (shoe[index] - 1,) +
+                           shoe[index + 1:])
+        table[value] = final_totals(value, value == ACE, composition,
+                                    infinite, target, stay)
+    return table
+
+def rules_key(decks, target, stay):
+    """Cache key describing the rules a table was computed for"""
+    shoe = 'infinite' if decks is None else f'{decks}'
+    return f'target{target}_stay{stay}_decks{shoe}'
+
+def cache_path(key, directory=CACHE_DIR):
+    """File holding the cached table for one set of rules"""
+    return os.path.join(directory, f'{key}.json')
+
+def load_cache(path):
+    """Read a cached table, or None if it has not been computed yet"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as cache_file:
+        return json.load(cache_file)
+
+def save_cache(path, table):
+    """Write one table atomically through a private temp file.
+
+    Each set of rules has its own file, so concurrent writers never
+    overwrite each other's tables.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with atomic_write(path, 'w', encoding='utf-8') as cache_file:
+        json.dump(table, cache_file, indent=1)
+
+def dealer_table(decks=None, target=TwentyOneGame.TARGET_SCORE,
+                 stay=Dealer.DEALER_MUST_STAY_SCORE, directory=CACHE_DIR):
+    """Exact dealer outcome table, read from the disk cache when possible.
+
+    `decks=None` means an infinite deck. The result maps each upcard's
+    hard value (1 for an ace) to {final total or 'bust': Fraction}.
+    """
+    path = cache_path(rules_key(decks, target, stay), directory)
+    cached = load_cache(path)
+
+    if cached is None:
+        table = compute_table(decks, target, stay)
+        save_cache(path, {
+            str(upcard): {str(outcome): str(probability)
+                          for outcome, probability in outcomes.items()}
+            for upcard, outcomes in table.items()
+        })
+        return table
+
+    return {
+        int(upcard): {(outcome if outcome == BUST else int(outcome)):
+                      Fraction(probability)
+                      for outcome, probability in outcomes.items()}
+        for upcard, outcomes in cached.items()
+    }
+
+def main():
+    """Print the dealer outcome table"""
+    parser = argparse.ArgumentParser(
+        description='Exact dealer outcome probabilities by upcard.')
+    parser.add_argument('--decks', type=int, default=None,
+                        help='number of decks (default: infinite deck)')
+    args = parser.parse_args()
+
+    table = dealer_table(args.decks)
+    outcomes = list(range(Dealer.DEALER_MUST_STAY_SCORE,
+                          TwentyOneGame.TARGET_SCORE + 1)) + [BUST]
+    print('upcard ' + ''.join(f'{outcome:>8}' for outcome in outcomes))
+    for upcard, distribution in table.items():
+        label = 'A' if upcard == ACE else str(upcard)
+        print(f'{label:>6} ' +
+              ''.join(f'{float(distribution.get(outcome, 0)):>8.4f}'
+                      for outcome in outcomes))
+
+if __name__ == '__main__':
+    main()
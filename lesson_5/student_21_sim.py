@@ -0,0 +1,176 @@
+""" Vectorized Monte Carlo simulator for the student_21 rules"""
+import argparse
+import time
+
+import numpy as np
+
+from drivers import ScriptedDriver
+from lesson_5.student_21 import Card, Dealer, TwentyOneGame
+from lesson_5.student_21_dealer import ACE, hand_total
+from lesson_5.student_21_strategy import AutoPlayer, StrategyTable
+
+DEFAULT_BATCH_SIZE = 100_000
+
+# Hard value (aces as 1) of every card in one deck, in Deck's order.
+DECK_VALUES = np.array([ACE if card.is_ace() else card.get_value()
+                        for card in (Card(rank, suit)
+                                     for suit in Card.SUITS
+                                     for rank in Card.RANKS)],
+                       dtype=np.int8)
+DECK_SIZE = len(DECK_VALUES)
+
+class SimulationResult:
+    """Win/loss/push counts for one player strategy"""
+    def __init__(self, wins=0, losses=0, pushes=0):
+        self.wins = wins
+        self.losses = losses
+        self.pushes = pushes
+
+    @property
+    def rounds(self):
+        """Number of rounds played"""
+        return self.wins + self.losses + self.pushes
+
+    @property
+    def win_rate(self):
+        """Share of rounds won"""
+        return self.wins / self.rounds
+
+    @property
+    def loss_rate(self):
+        """Share of rounds lost"""
+        return self.losses / self.rounds
+
+    @property
+    def push_rate(self):
+        """Share of rounds tied"""
+        return self.pushes / self.rounds
+
+    @property
+    def expected_value(self):
+        """Average dollars won per $1 bet"""
+        return (self.wins - self.losses) / self.rounds
+
+    def add(self, wins, losses, pushes):
+        """Add the outcome counts of one batch"""
+        self.wins += wins
+        self.losses += losses
+        self.pushes += pushes
+
+    def __str__(self):
+        return (f"win {self.win_rate:.4f}  loss {self.loss_rate:.4f}  "
+                f"push {self.push_rate:.4f}  EV {self.expected_value:+.4f}")
+
+class ShoeBatch:
+    """One freshly shuffled deck per round, as in play_one_round.
+
+    Decks are shuffled lazily: each draw runs one Fisher-Yates step on the
+    rows that draw, so only the cards actually dealt are ever shuffled.
+    """
+    def __init__(self, rng, rounds):
+        self.rng = rng
+        self.cards = np.tile(DECK_VALUES, rounds)
+        self.cursor = np.arange(rounds, dtype=np.int32) * DECK_SIZE
+        self.remaining = np.full(rounds, DECK_SIZE, dtype=np.int32)
+
+    def draw(self, rows):
+        """Deal the next card from the deck of every round in `rows`"""
+        top = self.cursor[rows]
+        swap = top + self.rng.integers(0, self.remaining[rows],
+                                       dtype=np.int32)
+        values = self.cards[swap]
+        self.cards[swap] = self.cards[top]
+        self.cards[top] = values
+        self.cursor[rows] = top + 1
+        self.remaining[rows] -= 1
+        return values
+
+def draw_while_below(shoes, rows, hard_totals, has_ace, stand_on):
+    """Deal to each hand in `rows` until its total reaches `stand_on`"""
+    while True:
+        totals = hand_total(hard_totals[rows], has_ace[rows],
+                            TwentyOneGame.TARGET_SCORE)
+        rows = rows[totals < stand_on]
+        if not len(rows):
+            return
+        values = shoes.draw(rows)
+        hard_totals[rows] += values
+        has_ace[rows] |= values == ACE
+
+def play_batch(rng, rounds, stand_on):
+    """Play `rounds` rounds and return (wins, losses, pushes)"""
+    shoes = ShoeBatch(rng, rounds)
+    everyone = np.arange(rounds)
+
+    # deal_initial_cards: player, dealer, player, dealer.
+    first, second, third, fourth = (shoes.draw(everyone).astype(np.int16)
+                                    for _ in range(4))
+    player = first + third
+    player_ace = (first == ACE) | (third == ACE)
+    dealer = second + fourth
+    dealer_ace = (second == ACE) | (fourth == ACE)
+
+    draw_while_below(shoes, everyone, player, player_ace, stand_on)
+    player_busted = player > TwentyOneGame.TARGET_SCORE
+
+    draw_while_below(shoes, np.flatnonzero(~player_busted), dealer,
+                     dealer_ace, Dealer.DEALER_MUST_STAY_SCORE)
+    dealer_busted = dealer > TwentyOneGame.TARGET_SCORE
+
+    # Same order of checks as display_round_result.
+    player = hand_total(player, player_ace, TwentyOneGame.TARGET_SCORE)
+    dealer = hand_total(dealer, dealer_ace, TwentyOneGame.TARGET_SCORE)
+    wins = ~player_busted & (dealer_busted | (player > dealer))
+    losses = player_busted | (~dealer_busted & (dealer > player))
+    pushes = ~wins & ~losses
+    return int(wins.sum()), int(losses.sum()), int(pushes.sum())
+
+def simulate(rounds, stand_on_scores=(Dealer.DEALER_MUST_STAY_SCORE,),
+             seed=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Simulate `rounds` rounds for each "hit below N" player strategy"""
+    rng = np.random.default_rng(seed)
+    results = {stand_on: SimulationResult() for stand_on in stand_on_scores}
+
+    for start in range(0, rounds, batch_size):
+        batch = min(batch_size, rounds - start)
+        for stand_on, result in results.items():
+            result.add(*play_batch(rng, batch, stand_on))
+
+    return results
+
+def time_game_rounds(rounds):
+    """Seconds per round of the real game loop, played by AutoPlayer"""
+    # Load or build the strategy table before the clock starts.
+    StrategyTable.table()
+    game = TwentyOneGame(AutoPlayer(), ScriptedDriver(()))
+    with game.driver.session():
+        start = time.perf_counter()
+        for _ in range(rounds):
+            game.play_one_round()
+        return (time.perf_counter() - start) / rounds
+
+def main():
+    """Run the simulator and compare it with the real game loop"""
+    parser = argparse.ArgumentParser(
+        description='Monte Carlo simulation of the student_21 rules.')
+    parser.add_argument('rounds', type=int)
+    parser.add_argument('--stand-on', type=int, nargs='+',
+                        default=[Dealer.DEALER_MUST_STAY_SCORE])
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--reference-rounds', type=int, default=20_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = simulate(args.rounds, args.stand_on, args.seed)
+    vectorized = (time.perf_counter() - start) / args.rounds
+    for stand_on, result in results.items():
+        print(f"stand on {stand_on:>2}: {result}")
+
+    looped = time_game_rounds(args.reference_rounds)
+    per_strategy = vectorized / len(args.stand_on)
+    print(f"\n{1 / per_strategy:,.0f} rounds/s vectorized, "
+          f"{1 / looped:,.0f} rounds/s through TwentyOneGame "
+          f"({looped / per_strategy:.0f}x faster)")
+
+if __name__ == '__main__':
+    main()
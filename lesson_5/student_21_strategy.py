@@ -0,0 +1,216 @@
+""" Optimal hit/stay table for the student_21 rules and a Player using it"""
+import argparse
+import os
+from array import array
+from fractions import Fraction
+from functools import cache
+
+from files import atomic_write
+from lesson_5.student_21 import Dealer, Deck, Player, TwentyOneGame
+from lesson_5.student_21_dealer import (ACE, BUST, CARD_VALUES,
+                                        deck_composition, dealer_table,
+                                        hand_total, rules_key)
+
+STRATEGY_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STAY = 0
+HIT = 1
+CHOICES = {STAY: 's', HIT: 'h'}
+
+# One byte per (soft flag, player total, dealer upcard hard value).
+TOTALS = TwentyOneGame.TARGET_SCORE + 1
+UPCARDS = len(CARD_VALUES) + 1
+TABLE_SIZE = 2 * TOTALS * UPCARDS
+
+def strategy_path(stay=Dealer.DEALER_MUST_STAY_SCORE, directory=STRATEGY_DIR):
+    """File holding the decision table solved for the given rules"""
+    key = rules_key(None, TwentyOneGame.TARGET_SCORE, stay)
+    return os.path.join(directory, f'basic_strategy_{key}.bin')
+
+def table_index(total, soft, upcard):
+    """Position of a decision in the flat strategy table"""
+    return (int(soft) * TOTALS + total) * UPCARDS + upcard
+
+def upcard_value(card):
+    """Hard value of the dealer's upcard, 1 for an ace"""
+    return ACE if card.is_ace() else card.get_value()
+
+class StrategySolver:
+    """Dynamic programming over the rules with an infinite deck"""
+    def __init__(self, target=TwentyOneGame.TARGET_SCORE,
+                 stay=Dealer.DEALER_MUST_STAY_SCORE):
+        self.target = target
+        self.dealer = dealer_table(None, target, stay)
+        composition = deck_composition()
+        self.card_chances = [(value, Fraction(count, sum(composition)))
+                             for value, count in zip(CARD_VALUES,
+                                                     composition)]
+        self.best = cache(self._best)
+
+    def stay_value(self, total, upcard):
+        """Expected result of staying, per $1 bet"""
+        value = Fraction(0)
+        for outcome, probability in self.dealer[upcard].items():
+            if outcome == BUST or outcome < total:
+                value += probability
+            elif outcome > total:
+                value -= probability
+        return value
+
+    def hit_value(self, hard_total, has_ace, upcard):
+        """Expected result of hitting once and then playing optimally"""
+        value = Fraction(0)
+        for card, chance in self.card_chances:
+            next_total = hard_total + card
+            if next_total > self.target:
+                value -= chance
+            else:
+                value += chance * self.best(next_total, has_ace or
+                                            card == ACE, upcard)[0]
+        return value
+
+    def _best(self, hard_total, has_ace, upcard):
+        """(expected value, decision) of the better of hit and stay"""
+        total = hand_total(hard_total, has_ace, self.target)
+        stay = self.stay_value(total, upcard)
+        hit = self.hit_value(hard_total, has_ace, upcard)
+        return (hit, HIT) if hit > stay else (stay, STAY)
+
+    def round_value(self):
+        """Expected result of a whole round played with this strategy"""
+        value = Fraction(0)
+        for upcard, upcard_chance in self.card_chances:
+            for first, first_chance in self.card_chances:
+                for second, second_chance in self.card_chances:
+                    value += (upcard_chance * first_chance * second_chance *
+                              self.best(first + second,
+                                        ACE in (first, second), upcard)[0])
+        return value
+
+    def solve(self):
+        """Build the flat decision table for every reachable situation"""
+        table = array('B', bytes(TABLE_SIZE))
+        for hard_total in range(2, self.target + 1):
+            for has_ace in (False, True):
+                total = hand_total(hard_total, has_ace, self.target)
+                soft = total != hard_total
+                for upcard in CARD_VALUES:
+                    decision = self.best(hard_total, has_ace, upcard)[1]
+                    table[table_index(total, soft, upcard)] = decision
+        return table
+
+class StrategyTable:
+    """Loads decision tables lazily and answers lookups in O(1)"""
+    _tables = {}
+
+    @classmethod
+    def table(cls, stay=Dealer.DEALER_MUST_STAY_SCORE):
+        """Decision table for the rules, built and saved on first use"""
+        if stay not in cls._tables:
+            path = strategy_path(stay)
+            if not os.path.exists(path):
+                build(stay, path)
+            table = array('B')
+            with open(path, 'rb') as strategy_file:
+                table.fromfile(strategy_file, TABLE_SIZE)
+            cls._tables[stay] = table
+        return cls._tables[stay]
+
+    @classmethod
+    def choice(cls, total, soft, upcard, stay=Dealer.DEALER_MUST_STAY_SCORE):
+        """'h' or 's' for the given situation"""
+        return CHOICES[cls.table(stay)[table_index(total, soft, upcard)]]
+
+def build(stay=Dealer.DEALER_MUST_STAY_SCORE, path=None):
+    """Solve the rules and write the decision table to disk"""
+    path = path or strategy_path(stay)
+    table = StrategySolver(stay=stay).solve()
+    with atomic_write(path) as strategy_file:
+        table.tofile(strategy_file)
+    return table
+
+class AutoPlayer(Player):
+    """Player that hits or stays by looking up the strategy table"""
+    def decide(self, dealer_upcard):
+        """Look up the optimal choice for the current hand"""
+        return StrategyTable.choice(self.hand_total, self.hand.is_soft(),
+                                    upcard_value(dealer_upcard))
+
+def deviation_report(decisions, solver=None):
+    """How a list of recorded decisions compares with optimal play.
+
+    Returns (decisions, mistakes, expected dollars lost to mistakes).
+    """
+    solver = solver or StrategySolver()
+    mistakes = 0
+    lost = Fraction(0)
+    for total, soft, upcard_card, choice in decisions:
+        upcard = upcard_value(upcard_card)
+        best = StrategyTable.choice(total, soft, upcard)
+        if choice == best:
+            continue
+
+        mistakes += 1
+        hard_total = total - 10 if soft else total
+        stay = solver.stay_value(total, upcard)
+        hit = solver.hit_value(hard_total, soft, upcard)
+        lost += abs(hit - stay)
+    return len(decisions), mistakes, lost
+
+def simulate_rounds(rounds):
+    """Average result per $1 bet of AutoPlayer over real student_21 rounds"""
+    player = AutoPlayer()
+    dealer = Dealer()
+    deck = Deck()
+    net = 0
+    for _ in range(rounds):
+        deck.shuffle_deck()
+        player.reset_hand()
+        dealer.reset_hand()
+        for _ in range(2):
+            player.draw_card(deck)
+            dealer.draw_card(deck)
+
+        upcard = dealer.hand.cards[0]
+        while player.decide(upcard) == 'h':
+            player.draw_card(deck)
+            if player.is_busted():
+                break
+        if not player.is_busted():
+            while dealer.should_hit():
+                dealer.draw_card(deck)
+
+        if player.is_busted():
+            net -= 1
+        elif dealer.is_busted() or player.hand_total > dealer.hand_total:
+            net += 1
+        elif dealer.hand_total > player.hand_total:
+            net -= 1
+    return net / rounds
+
+def main():
+    """Print the strategy table and check it against simulated play"""
+    parser = argparse.ArgumentParser(
+        description='Optimal hit/stay table for Twenty One.')
+    parser.add_argument('--rounds', type=int, default=0,
+                        help='also simulate this many rounds with it')
+    args = parser.parse_args()
+
+    StrategyTable.table()
+    print('        ' + ''.join(f'{"A" if upcard == ACE else upcard:>3}'
+                               for upcard in CARD_VALUES))
+    for soft, totals in ((False, range(4, TOTALS)),
+                         (True, range(13, TOTALS))):
+        for total in totals:
+            label = f'{"soft" if soft else "hard"} {total:>2}'
+            print(f'{label:<8}' +
+                  ''.join(f'{StrategyTable.choice(total, soft, upcard):>3}'
+                          for upcard in CARD_VALUES))
+
+    print(f'\nExpected value (infinite deck): '
+          f'{float(StrategySolver().round_value()):+.4f}')
+    if args.rounds:
+        print(f'Simulated EV: {simulate_rounds(args.rounds):+.4f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from lesson_5.oo_ttt import Board, Computer, OpeningBook, Square
+
+GAMES_PER_CHUNK = 10_000
+
+class MatchResult:
+    def __init__(self, first_wins=0, second_wins=0, draws=0, elapsed=0.0):
+        self.first_wins = first_wins
+        self.second_wins = second_wins
+        self.draws = draws
+        self.elapsed = elapsed
+
+    @property
+    def games(self):
+        return self.first_wins + self.second_wins + self.draws
+
+    @property
+    def games_per_second(self):
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def add(self, other):
+        self.first_wins += other.first_wins
+        self.second_wins += other.second_wins
+        self.draws += other.draws
+
+    def __str__(self):
+        return (f'{self.games} games in {self.elapsed:.2f}s '
+                f'({self.games_per_second:,.0f} games/s)\n'
+                f'First strategy wins: {self.first_wins}\n'
+                f'Second strategy wins: {self.second_wins}\n'
+                f'Draws: {self.draws}')
+
+def play_headless(first, second, size, win_length):
+    board = Board(size, win_length)
+    players = (first, second)
+    turn = 0
+
+    while True:
+        player = players[turn % 2]
+        board.mark_square_at(player.choose_square(board), player.marker)
+        if board.has_winning_row(player.marker):
+            return player
+        if board.is_full():
+            return None
+        turn += 1
+
+def play_chunk(chunk_index, games, strategies, seed, size, win_length,
+               mcts_budget):
+    # Every chunk gets its own seeds, so a match is reproducible no matter
+    # which worker process ends up playing which chunk.
+    chunk_seed = seed * 1_000_003 + chunk_index
+    first = Computer(strategies[0], chunk_seed * 2, Square.HUMAN_MARKER,
+                     *mcts_budget)
+    second = Computer(strategies[1], chunk_seed * 2 + 1,
+                      Square.COMPUTER_MARKER, *mcts_budget)
+    result = MatchResult()
+
+    for game_number in range(games):
+        # The strategies take turns going first.
+        if game_number % 2 == 0:
+            winner = play_headless(first, second, size, win_length)
+        else:
+            winner = play_headless(second, first, size, win_length)
+
+        if winner is first:
+            result.first_wins += 1
+        elif winner is second:
+            result.second_wins += 1
+        else:
+            result.draws += 1
+
+    return result
+
+def run_match(first_strategy, second_strategy, games, seed=0, workers=None,
+              size=Board.CLASSIC_SIZE, win_length=None,
+              mcts_iterations=None, mcts_seconds=None):
+    strategies = (first_strategy, second_strategy)
+    mcts_budget = (mcts_iterations, mcts_seconds)
+    chunks = [min(GAMES_PER_CHUNK, games - start)
+              for start in range(0, games, GAMES_PER_CHUNK)]
+    workers = workers or os.cpu_count()
+    result = MatchResult()
+
+    # Build the book once here rather than racing to build it in every
+    # worker.
+    if 'book' in strategies:
+        OpeningBook.ensure_built()
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunk_results = executor.map(play_chunk,
+                                     range(len(chunks)),
+                                     chunks,
+                                     [strategies] * len(chunks),
+                                     [seed] * len(chunks),
+                                     [size] * len(chunks),
+                                     [win_length] * len(chunks),
+                                     [mcts_budget] * len(chunks))
+        for chunk_result in chunk_results:
+            result.add(chunk_result)
+    result.elapsed = time.perf_counter() - start
+
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Play tic-tac-toe strategies against each other.')
+    parser.add_argument('first', choices=Computer.STRATEGIES)
+    parser.add_argument('second', choices=Computer.STRATEGIES)
+    parser.add_argument('games', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--size', type=int, default=Board.CLASSIC_SIZE)
+    parser.add_argument('--win-length', type=int, default=None)
+    parser.add_argument('--mcts-iterations', type=int, default=None,
+                        help='iterations per move for the mcts strategy')
+    parser.add_argument('--mcts-seconds', type=float, default=None,
+                        help='seconds per move for the mcts strategy')
+    args = parser.parse_args()
+
+    print(run_match(args.first, args.second, args.games, args.seed,
+                    args.workers, args.size, args.win_length,
+                    args.mcts_iterations, args.mcts_seconds))
+
+if __name__ == '__main__':
+    main()
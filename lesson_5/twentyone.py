@@ -1,12 +1,7 @@
 import random
-import os
-import time
 
-def clear_screen():
-    os.system('clear')
-
-def short_wait():
-    time.sleep(1.5)
+from drivers import ConsoleDriver
+from pacing import Pacer
 
 class Card:
     SUITS = ['Spades', 'Hearts', 'Clubs', 'Diamonds']
@@ -23,29 +18,79 @@ class Card:
         'Jack': 10,
         'Queen': 10,
         'King': 10,
-        'Ace': [1, 11]
+        'Ace': 1,
     }
+    SOFT_ACE_BONUS = 10
 
+    # Cards are read-only, so one set can be shared between any number of
+    # hands, shoes and games.
     def __init__(self, rank, suit, value):
-        self.rank = rank
-        self.suit = suit
-        self.value = value
+        self._rank = rank
+        self._suit = suit
+        self._value = value
+
+    @property
+    def rank(self):
+        return self._rank
+
+    @property
+    def suit(self):
+        return self._suit
+
+    @property
+    def value(self):
+        return self._value
+
+    def is_ace(self):
+        return self.rank == 'Ace'
 
     def __str__(self):
         return f'{self.rank} of {self.suit}'
 
+# The 52 shared cards, created once at import.
+Card.ALL = tuple(Card(rank, suit, value)
+                 for suit in Card.SUITS
+                 for rank, value in Card.RANKS.items())
+
 class Deck:
     def __init__(self):
         self.cards = self._initialize_deck()
 
     def _initialize_deck(self):
-        return ([Card(rank, suit, value) 
-                    for suit in Card.SUITS 
-                    for rank, value in Card.RANKS.items()])
+        return list(Card.ALL)
+
+class Shoe:
+
+    DECKS = 1
+    PENETRATION = 0.75
+
+    def __init__(self, decks=DECKS, penetration=PENETRATION, seed=None):
+        if decks < 1:
+            raise ValueError('A shoe needs at least one deck')
+        if not 0 < penetration <= 1:
+            raise ValueError('Penetration must be between 0 and 1')
+
+        self.decks = decks
+        self.penetration = penetration
+        self.cards = Deck().cards * decks
+        self.cut_index = int(len(self.cards) * penetration)
+        self.random = random.Random(seed)
+        self.shuffle()
+
+    def shuffle(self):
+        self.random.shuffle(self.cards)
+        self.next_index = 0
+
+    def needs_shuffle(self):
+        return self.next_index >= self.cut_index
 
     def deal(self):
-        card = random.choice(self.cards)
-        self.cards.remove(card)
+        if self.next_index == len(self.cards):
+            # Ran out of cards mid-round; start over with a fresh shoe.
+            self.shuffle()
+
+        card = self.cards[self.next_index]
+        self.next_index += 1
         return card
 
 class Player:
@@ -53,30 +98,43 @@ class Player:
     START_MONEY = 5
     RICH = 10
     POOR = 0
-    money = START_MONEY
 
     def __init__(self):
+        self.reset_hand()
+
+    def reset_hand(self):
         self.hand = []
+        self.hard_total = 0
+        self.ace_count = 0
+
+    def add_card(self, card):
+        self.hand.append(card)
+        self.hard_total += card.value
+        if card.is_ace():
+            self.ace_count += 1
 
     def busted(self):
-        return self.score() > TwentyOneGame.TARGET_SCORE
+        return self.hard_total > TwentyOneGame.TARGET_SCORE
 
     def score(self):
-        return sum([card.value for card in self.hand])
-    
-    def calculate_aces_in_hand(self):
-        ace_cards = [card for card in self.hand if card.rank == 'Ace']
-        for card in ace_cards:
-            card.value = 11
-        for card in ace_cards:
-            if self.score() > TwentyOneGame.TARGET_SCORE:
-                card.value = 1
+        # At most one ace can ever count as 11 without busting.
+        soft_total = self.hard_total + Card.SOFT_ACE_BONUS
+        if self.ace_count and soft_total <= TwentyOneGame.TARGET_SCORE:
+            return soft_total
+
+        return self.hard_total
 
 class Dealer(Player):
-    def __init__(self):
-        super().__init__()
+
+    STAY_SCORE = 17
+
+    def reset_hand(self):
+        super().reset_hand()
         self.card_hidden = True
 
+    def should_hit(self):
+        return self.score() < Dealer.STAY_SCORE
+
     def display_hand(self):
         if self.card_hidden:
 
@@ -92,6 +150,7 @@ class Dealer(Player):
 class Human(Player):
     def __init__(self):
         super().__init__()
+        self.money = Player.START_MONEY
     
     def display_hand(self):
         return ', '.join(str(card) for card in self.hand) + f': {self.score()}'
@@ -99,41 +158,81 @@ class Human(Player):
 class TwentyOneGame:
 
     TARGET_SCORE = 21
+    SHORT_WAIT = 1.5
 
-    def __init__(self):
+    def __init__(self, decks=Shoe.DECKS, penetration=Shoe.PENETRATION,
+                 seed=None, driver=None, pacer=None, renderer=None):
+        self.driver = driver or ConsoleDriver()
+        self.renderer = renderer or self.driver.renderer()
+        self.pacer = pacer or Pacer.from_environment()
         self.human = Human()
         self.dealer = Dealer()
-        self.deck = Deck()
+        self.seed = seed
+        self.deck = Shoe(decks, penetration, seed)
         self.winner = None
+        self.rounds_played = 0
 
-    def start(self):
-        self.display_welcome_message()
+    def new_round(self):
+        self.human.reset_hand()
+        self.dealer.reset_hand()
+        self.winner = None
+        if self.deck.needs_shuffle():
+            self.deck.shuffle()
 
-        while True:
+    def play_auto_round(self, should_hit):
+        self.new_round()
+        self.deal_initial_cards()
 
-            self.__init__()
-            self.deal_initial_cards()
-            self.player_turn()
-            if self.human.busted():
-                print('You busted!')
-                self.winner = self.dealer
-                short_wait()
-            else:
-                self.dealer_turn()
+        while (not self.human.busted() and
+               should_hit(self.human, self.dealer.hand[0])):
+            self.deal_card(self.human)
 
+        if self.human.busted():
+            self.winner = self.dealer
+        else:
+            self.dealer.reveal_card()
+            while self.dealer.should_hit():
+                self.deal_card(self.dealer)
             if self.dealer.busted():
-                print('Dealer busted!')
                 self.winner = self.human
-                short_wait()
 
-            self.determine_winner()
-            self.pay_up()
-            self.display_results()
+        self.determine_winner()
+        self.pay_up()
 
-            if self.reached_money_limit() or not self.play_again():
-                break
+    def start(self):
+        with self.driver.session():
+            if self.seed is None:
+                # Seed the shoe from the global random state, which a
+                # RecordingDriver saves and a ReplayDriver restores.
+                self.deck = Shoe(self.deck.decks, self.deck.penetration,
+                                 random.getrandbits(64))
+            self.display_welcome_message()
+
+            while True:
+
+                self.new_round()
+                self.deal_initial_cards()
+                self.player_turn()
+                if self.human.busted():
+                    self.driver.write('You busted!')
+                    self.winner = self.dealer
+                    self.short_wait()
+                else:
+                    self.dealer_turn()
+
+                if self.dealer.busted():
+                    self.driver.write('Dealer busted!')
+                    self.winner = self.human
+                    self.short_wait()
+
+                self.determine_winner()
+                self.pay_up()
+                self.display_results()
+
+                if self.reached_money_limit() or not self.play_again():
+                    break
 
-        self.display_goodbye_message()
+            self.display_goodbye_message()
 
     def reached_money_limit(self):
         return self.too_rich() or self.too_poor()
@@ -145,32 +244,40 @@ class TwentyOneGame:
         return self.human.money == Player.POOR
 
     def pay_up(self):
+        self.rounds_played += 1
         if self.winner == self.human:
-            self.human.__class__.money += 1
+            self.human.money += 1
         elif self.winner == self.dealer:
-            self.human.__class__.money -= 1
+            self.human.money -= 1
 
     def play_again(self):
-        choice = input('\nEnter "y" to play again. Press "Enter" to quit: ')
+        choice = self.driver.read('\nEnter "y" to play again. '
+                                  'Press "Enter" to quit: ')
         if choice.lower() == 'y':
             return True
         else:
             return False
 
+    def clear_screen(self):
+        self.renderer.clear()
+
+    def short_wait(self):
+        self.pacer.pause(self.SHORT_WAIT)
+
     def display_welcome_message(self):
-        clear_screen()
-        print('Welcome to Twenty One!\n')
+        self.clear_screen()
+        self.driver.write('Welcome to Twenty One!\n')
         self.display_money()
-        short_wait()
+        self.short_wait()
 
     def display_goodbye_message(self):
-        print()
+        self.driver.write()
         if self.too_poor():
-            print("You don't have enough money to keep playing :(")
+            self.driver.write("You don't have enough money to keep playing :(")
         elif self.too_rich():
-            print("You're rich enough! Enough playing!")
+            self.driver.write("You're rich enough! Enough playing!")
         else:
-            print('Thanks for playing! Bye bye :)')
+            self.driver.write('Thanks for playing! Bye bye :)')
 
     def deal_initial_cards(self):
         for _ in range(0, 2):
@@ -179,53 +286,55 @@ class TwentyOneGame:
     
     def deal_card(self, player):
         card = self.deck.deal()
-        player.hand.append(card)
-        player.calculate_aces_in_hand()
+        player.add_card(card)
         return card
 
     def display_cards(self):
-        clear_screen()
-        print(f'You have: {self.human.display_hand()}')
-        print(f'Dealer has: {self.dealer.display_hand()}')
+        with self.driver.frame(self.renderer):
+            self.driver.write(f'You have: {self.human.display_hand()}')
+            self.driver.write(f'Dealer has: {self.dealer.display_hand()}')
 
     def player_turn(self):
         while True:
             self.display_cards()
-            choice = input('\nWould you like to hit or stay? (h/s): ')
+            choice = self.driver.read('\nWould you like to hit or stay? '
+                                      '(h/s): ')
 
             if choice.lower() in ['h', 's']:
                 match choice.lower():
                     case 'h':
-                        print('You hit!\n')
-                        print(f'You drew: {self.deal_card(self.human)}')
-                        short_wait()
+                        self.driver.write('You hit!\n')
+                        card = self.deal_card(self.human)
+                        self.driver.write(f'You drew: {card}')
+                        self.short_wait()
 
                     case 's':
-                        print('You stayed...')
-                        short_wait()
+                        self.driver.write('You stayed...')
+                        self.short_wait()
                         break
 
                 if self.human.busted():
                     break
             else:
-                print('Sorry, that is not a valid choice')
-                short_wait()
+                self.driver.write('Sorry, that is not a valid choice')
+                self.short_wait()
 
     def dealer_turn(self):
         self.dealer.reveal_card()
-        clear_screen()
-        print('Dealer\'s turn...\n')
-        short_wait()
+        self.clear_screen()
+        self.driver.write('Dealer\'s turn...\n')
+        self.short_wait()
 
         while True:
             self.display_cards()
-            print()
-            short_wait()
-
-            if self.dealer.score() < 17:
-                print('Dealer Hit!\n')
-                print(f'Dealer drew: {self.deal_card(self.dealer)}')
-                short_wait()
+            self.driver.write()
+            self.short_wait()
+
+            if self.dealer.should_hit():
+                self.driver.write('Dealer Hit!\n')
+                card = self.deal_card(self.dealer)
+                self.driver.write(f'Dealer drew: {card}')
+                self.short_wait()
                 
             else:
                 break
@@ -246,18 +355,21 @@ class TwentyOneGame:
         self.dealer.reveal_card()
         self.display_cards()
 
-        print()
+        self.driver.write()
         if self.winner == self.human:
-            print('You won!')
+            self.driver.write('You won!')
         elif self.winner == self.dealer:
-            print('Dealer won!')
+            self.driver.write('Dealer won!')
         else:
-            print('It\'s a tie.')
+            self.driver.write('It\'s a tie.')
         
         self.display_money()
 
     def display_money(self):
-        print(f'You have ${self.human.__class__.money}.')
+        self.driver.write(f'You have ${self.human.money}.')
+
+def main():
+    TwentyOneGame().start()
 
-game = TwentyOneGame()
-game.start()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+from drivers import ScriptedDriver
+from lesson_5.twentyone import Dealer, Player, Shoe, TwentyOneGame
+from pacing import Pacer
+
+def stand_on(score):
+    def should_hit(player, dealer_upcard):
+        return player.score() < score
+
+    return should_hit
+
+class TableManager:
+    def __init__(self, sessions, decks=Shoe.DECKS,
+                 penetration=Shoe.PENETRATION, seed=None):
+        # Each session owns its game, shoe and bankroll; nothing is shared
+        # between tables except the read-only Card.ALL. Auto rounds never
+        # read input or pause, so the games run headless and unpaced.
+        self.sessions = [
+            TwentyOneGame(decks, penetration,
+                          None if seed is None else seed + index,
+                          ScriptedDriver(()), Pacer('zero'))
+            for index in range(sessions)
+        ]
+
+    def active_sessions(self):
+        return [game for game in self.sessions
+                if not game.reached_money_limit()]
+
+    def play_rounds(self, rounds, should_hit=stand_on(Dealer.STAY_SCORE)):
+        for _ in range(rounds):
+            for game in self.active_sessions():
+                game.play_auto_round(should_hit)
+
+    def play_rounds_threaded(self, rounds, workers,
+                             should_hit=stand_on(Dealer.STAY_SCORE)):
+        def play_session(game):
+            for _ in range(rounds):
+                if game.reached_money_limit():
+                    break
+                game.play_auto_round(should_hit)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(play_session, self.sessions))
+
+    def session_stats(self):
+        return [
+            {
+                'session': index,
+                'money': game.human.money,
+                'net': game.human.money - Player.START_MONEY,
+                'rounds': game.rounds_played,
+                'rich': game.too_rich(),
+                'broke': game.too_poor(),
+            }
+            for index, game in enumerate(self.sessions)
+        ]
+
+    def aggregate_stats(self):
+        bankrolls = [game.human.money for game in self.sessions]
+        return {
+            'sessions': len(self.sessions),
+            'rounds': sum(game.rounds_played for game in self.sessions),
+            'total_money': sum(bankrolls),
+            'mean_money': statistics.fmean(bankrolls),
+            'stdev_money': (statistics.stdev(bankrolls)
+                            if len(bankrolls) > 1 else 0.0),
+            'min_money': min(bankrolls),
+            'max_money': max(bankrolls),
+            'rich': sum(game.too_rich() for game in self.sessions),
+            'broke': sum(game.too_poor() for game in self.sessions),
+        }
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run many independent Twenty One tables at once.')
+    parser.add_argument('sessions', type=int)
+    parser.add_argument('rounds', type=int)
+    parser.add_argument('--decks', type=int, default=Shoe.DECKS)
+    parser.add_argument('--penetration', type=float,
+                        default=Shoe.PENETRATION)
+    parser.add_argument('--stand-on', type=int, default=Dealer.STAY_SCORE)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--threads', type=int, default=None)
+    args = parser.parse_args()
+
+    manager = TableManager(args.sessions, args.decks, args.penetration,
+                           args.seed)
+    if args.threads:
+        manager.play_rounds_threaded(args.rounds, args.threads,
+                                     stand_on(args.stand_on))
+    else:
+        manager.play_rounds(args.rounds, stand_on(args.stand_on))
+
+    for name, value in manager.aggregate_stats().items():
+        print(f'{name}: {value}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Pacing for the pauses games make between messages"""
+import os
+import time
+
+PACING_VARIABLE = 'GAMES_PACING'
+
+class Pacer:
+    """Waits out game pauses in one of several modes.
+
+    'real' sleeps for the full pause, 'scaled' for the pause times `scale`
+    and 'zero' not at all. 'async' never blocks: pauses add up in `owed`
+    for an asyncio host such as drivers.AsyncDriver to await, so one event
+    loop can pace many sessions.
+    """
+    MODES = ('real', 'scaled', 'zero', 'async')
+
+    def __init__(self, mode='real', scale=1.0):
+        if mode not in self.MODES:
+            raise ValueError(f'unknown pacing mode {mode!r}')
+        self.mode = mode
+        self.scale = scale if mode in ('scaled', 'async') else 1.0
+        self.owed = 0.0
+
+    @classmethod
+    def from_environment(cls):
+        """Pacer described by GAMES_PACING, e.g. 'zero' or 'scaled:0.25'
+
+        'async' is refused, since a console game has no event loop to
+        await its pauses.
+        """
+        setting = os.environ.get(PACING_VARIABLE, 'real')
+        mode, _, scale = setting.partition(':')
+        if mode == 'async':
+            raise ValueError(f'{PACING_VARIABLE}=async needs an asyncio '
+                             'host, see python -m games.paced_sessions')
+        return cls(mode, float(scale) if scale else 1.0)
+
+    def pause(self, seconds):
+        """Wait out a pause of `seconds` according to the mode"""
+        seconds *= self.scale
+        if self.mode == 'async':
+            self.owed += seconds
+        elif self.mode != 'zero' and seconds > 0:
+            time.sleep(seconds)
+
+    def take_owed(self):
+        """Seconds of pause owed so far; the debt starts again from zero"""
+        owed, self.owed = self.owed, 0.0
+        return owed
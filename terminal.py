@@ -0,0 +1,69 @@
+"""In-process terminal rendering shared by the games"""
+import shutil
+import sys
+
+CLEAR_SCREEN = '\x1b[H\x1b[2J'
+CLEAR_LINE = '\x1b[2K'
+CLEAR_BELOW = '\x1b[J'
+
+def move_to(row):
+    """Escape sequence that moves the cursor to the start of a 1-based row"""
+    return f'\x1b[{row};1H'
+
+class TerminalRenderer:
+    """Draws frames with ANSI escapes, rewriting only the rows that changed.
+
+    Rows are addressed from the top of the screen, so a frame taller or
+    wider than the terminal, which would wrap or scroll, is always redrawn
+    in full.
+    """
+    def __init__(self, stream=None):
+        self.stream = stream
+        self._frame = None
+
+    def clear(self):
+        """Clear the screen and forget the last frame"""
+        self._write(CLEAR_SCREEN)
+        self._frame = []
+
+    def render(self, text):
+        """Draw `text` from the top of the screen in a single write"""
+        lines = text.split('\n')
+        if lines and lines[-1] == '':
+            lines.pop()
+
+        fits = self._fits(lines)
+        if self._frame is None or not fits:
+            output = [CLEAR_SCREEN, '\n'.join(lines)]
+            if lines:
+                output.append('\n')
+        else:
+            output = []
+            for row, line in enumerate(lines):
+                if row >= len(self._frame) or self._frame[row] != line:
+                    output.append(f'{move_to(row + 1)}{CLEAR_LINE}{line}')
+            output.append(move_to(len(lines) + 1))
+            output.append(CLEAR_BELOW)
+
+        self._frame = lines if fits else None
+        self._write(''.join(output))
+
+    @staticmethod
+    def _fits(lines):
+        columns, rows = shutil.get_terminal_size()
+        # One row stays free for the prompt written after the frame.
+        return (len(lines) < rows and
+                all(len(line) <= columns for line in lines))
+
+    def _write(self, text):
+        stream = self.stream or sys.stdout
+        stream.write(text)
+        stream.flush()
+
+class NullRenderer(TerminalRenderer):
+    """Renderer for headless runs: frames are built but never written"""
+    def clear(self):
+        """Nothing to clear"""
+
+    def render(self, text):
+        """Discard the frame"""